@@ -0,0 +1,62 @@
+"""
+資料儲存後端效能測試。
+
+分別以各後端模擬使用者加入/離開動態語音頻道之事件處理，
+比較直接呼叫後端與經由記憶體快取(寫回)之吞吐量。
+
+python -m benchmarks.backends [cycles]
+"""
+import db_operation as dbo
+from db_operation import aio as adbo
+
+from asyncio import run
+from os.path import join
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+# 每次循環之事件數(加入、離開、回到、刪除)
+EVENTS_PER_CYCLE = 4
+
+def direct(backend: dbo.StorageBackend, cycles: int) -> float:
+    guild_id = backend.database_init(0)
+    start = perf_counter()
+    for channel_id in range(cycles):
+        user_id = channel_id + 1
+        backend.new_channel(guild_id, channel_id)
+        backend.add_admin(guild_id, channel_id, user_id)
+        backend.member_leave(guild_id, channel_id, user_id)
+        if backend.can_claim(guild_id, channel_id) and backend.last_admin(guild_id, channel_id) == user_id:
+            backend.add_admin(guild_id, channel_id, user_id)
+        backend.delete_channel(guild_id, channel_id)
+    return cycles * EVENTS_PER_CYCLE / (perf_counter() - start)
+
+async def cached(cycles: int) -> float:
+    store = dbo.ChannelStateStore(flush_interval=1, flush_threshold=256)
+    guild_id = await adbo.database_init(0)
+    await store.load(guild_id)
+    store.start()
+    start = perf_counter()
+    for channel_id in range(cycles):
+        user_id = channel_id + 1
+        store.new_channel(guild_id, channel_id)
+        store.add_admin(guild_id, channel_id, user_id)
+        store.member_leave(guild_id, channel_id, user_id)
+        if store.can_claim(guild_id, channel_id) and store.last_admin(guild_id, channel_id) == user_id:
+            store.add_admin(guild_id, channel_id, user_id)
+        store.delete_channel(guild_id, channel_id)
+    await store.stop()
+    return cycles * EVENTS_PER_CYCLE / (perf_counter() - start)
+
+if __name__ == "__main__":
+    cycles = int(argv[1]) if len(argv) > 1 else 2000
+    with TemporaryDirectory() as dir_path:
+        dbo.POOL.configure(join(dir_path, "bench.db"), "thread", {"journal_mode": "wal", "synchronous": "normal"})
+        for name in dbo.BACKENDS.keys():
+            backend = dbo.use_backend(name)
+            backend.migrate()
+            print(f"{name:>8} direct: {direct(backend, cycles):>10.0f} events/s")
+            print(f"{name:>8} cached: {run(cached(cycles)):>10.0f} events/s")
+        dbo.get_backend().close()
+        dbo.POOL.close()
+    adbo.EXECUTOR.shutdown()
@@ -0,0 +1,64 @@
+"""
+指令解析與分派效能測試。
+
+以多種指令訊息反覆解析(修飾、移除前墜、切分)並取得對應之指令類別，
+比較原先之if/elif判斷鏈與`COMMANDS`字典查詢之每秒處理數。
+
+python -m benchmarks.command_dispatch [rounds]
+"""
+from commands import *
+from configs import DISCORD_PREFIXS
+
+from sys import argv
+from time import perf_counter
+from typing import Optional
+
+PREFIX = DISCORD_PREFIXS[0]
+# 各指令(含不存在之指令)之訊息內容
+MESSAGES = [
+    f"{PREFIX}{content}" for content in (
+        "help", "help limit", "name Study Room", "limit 5", "bitrate 64", "hide", "unhide",
+        "lock", "unlock", "kick <@1234>", "ban <@1234> <@5678>", "unban <@1234>",
+        "mute", "unmute", "br 96", "unknown command",
+    )
+]
+
+def parse(content: str) -> tuple[str, Optional[tuple]]:
+    command = content.strip().lower()
+    for preifx in DISCORD_PREFIXS:
+        command = command.removeprefix(preifx)
+    _res = command.split(" ")
+    if len(_res) < 2: return _res[0], None
+    return _res[0], tuple(_res[1:])
+
+def chain(command: str) -> Optional[type[BaseCommand]]:
+    # 原先之判斷方式
+    if command == "help": return Help
+    elif command == "name": return Name
+    elif command == "limit": return Limit
+    elif command == "bitrate": return BitRate
+    elif command == "hide": return Hide
+    elif command == "unhide": return UnHide
+    elif command == "lock": return Lock
+    elif command == "unlock": return UnLock
+    elif command == "kick": return Kick
+    elif command == "ban": return Ban
+    elif command == "unban": return UnBan
+    elif command == "mute": return Mute
+    elif command == "unmute": return UnMute
+    return None
+
+def measure(dispatch, rounds: int) -> float:
+    messages = MESSAGES
+    start = perf_counter()
+    for _ in range(rounds):
+        for content in messages:
+            command, args = parse(content)
+            dispatch(command)
+    return rounds * len(messages) / (perf_counter() - start)
+
+if __name__ == "__main__":
+    rounds = int(argv[1]) if len(argv) > 1 else 20000
+    print(f"{len(COMMANDS)} registered names, {len(MESSAGES)} messages per round")
+    for name, dispatch in (("if/elif", chain), ("registry", get_command)):
+        print(f"{name:<8}: {measure(dispatch, rounds):,.0f} messages/s")
@@ -0,0 +1,61 @@
+"""
+指令解析效能測試。
+
+以模擬之聊天流量(多數為一般對話，少數為指令)比較原先之解析方式
+(修飾、轉小寫、檢查前墜、逐一移除前墜、切分)與`CommandTokenizer`之每秒處理數。
+
+python -m benchmarks.command_tokenizer [messages] [command_ratio]
+"""
+from modules import CommandTokenizer
+
+from random import Random
+from sys import argv
+from time import perf_counter
+from typing import Optional
+
+PREFIXES = ("$", "dvc!", "dvc ")
+COMMANDS = (
+    "help", "help limit", "name Study Room", "limit 5", "bitrate 64", "hide", "unhide",
+    "lock", "unlock", "kick <@123456789012345678>", "ban <@123456789012345678>", "mute",
+)
+WORDS = (
+    "ok", "lol", "brb", "anyone", "up", "for", "ranked", "tonight", "?", "the", "mic", "is",
+    "broken", "again", "https://example.com/some/long/link", "gg", "wp", "one", "more", "game",
+)
+
+def traffic(count: int, ratio: float, seed: int=0) -> list[str]:
+    rng = Random(seed)
+    messages = []
+    for _ in range(count):
+        if rng.random() < ratio:
+            prefix = rng.choice(PREFIXES)
+            messages.append(prefix + rng.choice(COMMANDS))
+        else:
+            words = rng.choices(WORDS, k=rng.randint(1, 40))
+            messages.append(" ".join(words).capitalize())
+    return messages
+
+def legacy(content: str) -> Optional[tuple[str, Optional[tuple]]]:
+    # 原先之解析方式
+    command = content.strip().lower()
+    if not command.startswith(PREFIXES): return None
+    for preifx in PREFIXES:
+        command = command.removeprefix(preifx)
+    _res = command.split(" ")
+    if len(_res) < 2: return _res[0], None
+    return _res[0], tuple(_res[1:])
+
+def measure(parse, messages: list[str]) -> float:
+    start = perf_counter()
+    for content in messages:
+        parse(content)
+    return len(messages) / (perf_counter() - start)
+
+if __name__ == "__main__":
+    count = int(argv[1]) if len(argv) > 1 else 200000
+    ratio = float(argv[2]) if len(argv) > 2 else 0.05
+    messages = traffic(count, ratio)
+    tokenizer = CommandTokenizer(PREFIXES)
+    print(f"{count} messages, {ratio:.0%} commands")
+    for name, parse in (("legacy", legacy), ("tokenizer", tokenizer.tokenize)):
+        print(f"{name:<9}: {measure(parse, messages):,.0f} messages/s")
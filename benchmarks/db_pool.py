@@ -0,0 +1,54 @@
+"""
+連線池效能測試。
+
+模擬數千次使用者加入/離開動態語音頻道之資料庫操作，
+比較各連線模式下每秒可完成之操作數。
+
+python -m benchmarks.db_pool [cycles]
+"""
+import db_operation as dbo
+
+from os.path import join
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+# 每次循環之資料庫操作數
+OPS_PER_CYCLE = 8
+
+def join_leave_cycle(guild_id: int, channel_id: int, user_id: int) -> None:
+    # 加入起始頻道: 創建頻道並新增管理員
+    dbo.new_channel(guild_id, channel_id)
+    dbo.add_admin(guild_id, channel_id, user_id)
+    # 管理員離開頻道
+    dbo.can_claim(guild_id, channel_id)
+    dbo.remove_admin(guild_id, channel_id, user_id)
+    dbo.can_claim(guild_id, channel_id)
+    # 管理員回到頻道
+    if dbo.last_admin(guild_id, channel_id) == user_id:
+        dbo.add_admin(guild_id, channel_id, user_id)
+    # 頻道刪除
+    dbo.delete_channel(guild_id, channel_id)
+
+def run(mode: str, cycles: int) -> float:
+    with TemporaryDirectory() as dir_path:
+        dbo.POOL.configure(join(dir_path, "bench.db"), mode)
+        guild_id = dbo.database_init(0)
+        start = perf_counter()
+        for i in range(cycles):
+            join_leave_cycle(guild_id, i, i + 1)
+        elapsed = perf_counter() - start
+        dbo.POOL.close()
+    return cycles * OPS_PER_CYCLE / elapsed
+
+if __name__ == "__main__":
+    cycles = int(argv[1]) if len(argv) > 1 else 2000
+    baseline = None
+    for mode in dbo.POOL_MODES:
+        ops = run(mode, cycles)
+        if baseline == None: baseline = ops
+        print(f"{mode:>8}: {ops:>10.0f} ops/s ({ops / baseline:.2f}x)")
+    # 各指令之耗時
+    for name, calls, elapsed in dbo.statement_stats():
+        if calls == 0: continue
+        print(f"{name:>24}: {calls:>7} calls {elapsed / calls * 1e6:>8.1f} us/call")
@@ -0,0 +1,51 @@
+"""
+SQLite PRAGMA設定效能測試。
+
+以`add_admin`/`remove_admin`之工作負載，
+比較各`journal_mode`與`synchronous`組合下之提交延遲。
+
+python -m benchmarks.db_pragmas [rounds]
+"""
+import db_operation as dbo
+
+from os.path import join
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+SETTINGS = [
+    {"journal_mode": "delete", "synchronous": "full"},
+    {"journal_mode": "delete", "synchronous": "normal"},
+    {"journal_mode": "wal", "synchronous": "full"},
+    {"journal_mode": "wal", "synchronous": "normal"},
+    {"journal_mode": "wal", "synchronous": "normal", "cache_size": -8000, "mmap_size": 67108864},
+]
+
+def run(pragmas: dict, rounds: int) -> list[float]:
+    latency = []
+    with TemporaryDirectory() as dir_path:
+        dbo.POOL.configure(join(dir_path, "bench.db"), "thread", pragmas)
+        dbo.migrate()
+        guild_id = dbo.database_init(0)
+        for channel_id in range(16):
+            dbo.new_channel(guild_id, channel_id)
+        for i in range(rounds):
+            channel_id = i % 16
+            start = perf_counter()
+            dbo.add_admin(guild_id, channel_id, i)
+            latency.append(perf_counter() - start)
+            start = perf_counter()
+            dbo.remove_admin(guild_id, channel_id, i)
+            latency.append(perf_counter() - start)
+        dbo.POOL.close()
+    latency.sort()
+    return latency
+
+if __name__ == "__main__":
+    rounds = int(argv[1]) if len(argv) > 1 else 1000
+    for pragmas in SETTINGS:
+        latency = run(pragmas, rounds)
+        mean = sum(latency) / len(latency) * 1000
+        p99 = latency[int(len(latency) * 0.99)] * 1000
+        name = ", ".join(f"{key}={value}" for key, value in pragmas.items())
+        print(f"{name:<80} mean {mean:7.3f} ms  p99 {p99:7.3f} ms")
@@ -0,0 +1,92 @@
+"""
+回覆Embed建立效能測試。
+
+比較每次回覆皆重新建立Embed(原先之方式)與複製預先建立之模板並填入作者、時間與訊息之每次耗時。
+
+python -m benchmarks.embeds [rounds]
+"""
+from commands import *
+from commands import _HELP_TEMPLATES, _format_error_embed_generator, _stamp, _success_embed_generator
+from configs import DISCORD_PREFIXS, TIMEZONE
+
+from datetime import datetime
+from sys import argv
+from time import perf_counter
+
+from discord import Embed
+
+class FakeAvatar:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+class FakeAuthor:
+    display_name = "Benchmark User"
+    display_avatar = FakeAvatar()
+
+def legacy_success(author: FakeAuthor, message: str) -> Embed:
+    # 原先之方式
+    embed = Embed(
+        color=0x00ff00,
+        title="命令執行成功",
+        description=message,
+        timestamp=datetime.now(TIMEZONE)
+    )
+    embed.set_author(
+        name=author.display_name,
+        icon_url=author.display_avatar.url
+    )
+    return embed
+
+def legacy_error(author: FakeAuthor, command: str) -> Embed:
+    embed = Embed(
+        color=0xff0000,
+        title="發生錯誤!",
+        description=f"格式錯誤，請使用`help {command}`取得詳細說明。",
+        timestamp=datetime.now(TIMEZONE)
+    )
+    embed.set_author(
+        name=author.display_name,
+        icon_url=author.display_avatar.url
+    )
+    return embed
+
+def legacy_help(author: FakeAuthor, command: type[BaseCommand]) -> Embed:
+    _e_prefix = DISCORD_PREFIXS[0]
+    embed = Embed(
+        color=0xffc800,
+        title=f"指令說明 - `{command.name}`",
+        timestamp=datetime.now(TIMEZONE),
+    )
+    embed.description = "\n".join([
+        f"指令有效開頭:`{'|'.join(DISCORD_PREFIXS)}`",
+        f"格式 - `{command.usage}`",
+    ])
+    intro = map(lambda in_str: f"> {in_str}", command.intro)
+    embed.add_field(name="說明", value="\n".join(intro), inline= False)
+    if len(command.arguments) != 0:
+        args = map(lambda in_str: f"> {in_str}", command.arguments)
+        embed.add_field(name="參數", value="\n".join(args), inline= False)
+    example = map(lambda in_str: f"> `{_e_prefix}{in_str}`", command.examples)
+    embed.add_field(name="範例", value="\n".join(example), inline= False)
+    embed.set_author(
+        name=author.display_name,
+        icon_url=author.display_avatar.url
+    )
+    return embed
+
+def measure(func, rounds: int) -> float:
+    start = perf_counter()
+    for _ in range(rounds): func()
+    return (perf_counter() - start) / rounds
+
+if __name__ == "__main__":
+    rounds = int(argv[1]) if len(argv) > 1 else 20000
+    author = FakeAuthor()
+    text = "修改成功，已將頻道人數限制由`0`人改為`10`人。"
+    cases = (
+        ("success", lambda: legacy_success(author, text), lambda: _success_embed_generator(author, text)),
+        ("format error", lambda: legacy_error(author, "limit"), lambda: _format_error_embed_generator(author, "limit")),
+        ("help limit", lambda: legacy_help(author, Limit), lambda: _stamp(_HELP_TEMPLATES[Limit], author)),
+    )
+    for name, before, after in cases:
+        old, new = measure(before, rounds), measure(after, rounds)
+        print(f"{name:<12}: rebuild {old * 1e6:.1f}us, template {new * 1e6:.1f}us ({old / new:.1f}x)")
@@ -0,0 +1,113 @@
+"""
+加入起始頻道之突發流量測試。
+
+以模擬之Discord API(固定往返延遲與各路由之伺服器端限流)模擬多位使用者同時加入起始頻道，
+比較逐一處理(創建頻道、移動使用者、設定權限)、不限流之並行處理，
+與經由`JoinPipeline`並行處理(API呼叫經由`RestScheduler`)之加入至移入延遲。
+
+python -m benchmarks.join_burst [joins] [concurrency] [rtt_ms]
+"""
+from modules import LatencyRecorder, TokenBucket
+from voice_operation import INTERACTIVE, JoinPipeline, RestScheduler
+
+from asyncio import gather, run, sleep
+from itertools import count
+from sys import argv
+from time import perf_counter
+
+# 客戶端限制(時間尺度經壓縮，以縮短測試時間)
+CLIENT_LIMITS = {
+    "create_channel": (10, 1.0),
+    "move_member": (10, 1.0),
+    "edit_channel": (10, 1.0),
+}
+# 模擬之伺服器端限制，較客戶端設定略為寬鬆
+SERVER_LIMITS = {route: (rate + 1, per) for route, (rate, per) in CLIENT_LIMITS.items()}
+# 觸發限流(429)時之懲罰秒數
+RETRY_AFTER = 1.0
+
+class FakeAPI:
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+        self.calls = 0
+        self.limited = 0
+        self.buckets = {route: TokenBucket(*limit) for route, limit in SERVER_LIMITS.items()}
+
+    async def request(self, route: str) -> None:
+        while True:
+            self.calls += 1
+            await sleep(self.rtt)
+            bucket = self.buckets[route]
+            if bucket.tokens >= 1:
+                bucket._tokens -= 1
+                return
+            # 429，等待後重試
+            self.limited += 1
+            await sleep(RETRY_AFTER)
+
+class FakeChannel:
+    def __init__(self, api: FakeAPI, channel_id: int) -> None:
+        self.api = api
+        self.id = channel_id
+
+    async def set_permissions(self, member, overwrite=None) -> None:
+        await self.api.request("edit_channel")
+
+class FakeCategory:
+    def __init__(self, api: FakeAPI) -> None:
+        self.api = api
+        self.ids = count(1)
+
+    async def create_voice_channel(self, name: str, overwrites=None) -> FakeChannel:
+        await self.api.request("create_channel")
+        return FakeChannel(self.api, next(self.ids))
+
+class FakeMember:
+    def __init__(self, api: FakeAPI, member_id: int) -> None:
+        self.api = api
+        self.id = member_id
+
+    async def move_to(self, channel: FakeChannel) -> None:
+        await self.api.request("move_member")
+
+async def serial(joins: int, rtt: float) -> tuple[LatencyRecorder, FakeAPI]:
+    api = FakeAPI(rtt)
+    category = FakeCategory(api)
+    latency = LatencyRecorder()
+    start = perf_counter()
+    for member in [FakeMember(api, i) for i in range(joins)]:
+        channel = await category.create_voice_channel("")
+        await member.move_to(channel)
+        latency.record(perf_counter() - start)
+        await channel.set_permissions(member)
+    return latency, api
+
+async def pipelined(joins: int, rtt: float, concurrency: int, throttle: bool=True) -> tuple[LatencyRecorder, FakeAPI]:
+    api = FakeAPI(rtt)
+    category = FakeCategory(api)
+    pipeline = JoinPipeline(concurrency)
+    scheduler = RestScheduler(concurrency, CLIENT_LIMITS)
+
+    async def handler(member: FakeMember) -> None:
+        if not throttle:
+            channel = await category.create_voice_channel("", overwrites={})
+            await member.move_to(channel)
+            return
+        channel = await scheduler.request(INTERACTIVE, "create_channel", 0, category.create_voice_channel, "", overwrites={})
+        await scheduler.request(INTERACTIVE, "move_member", 0, member.move_to, channel)
+
+    start = perf_counter()
+    await gather(*(pipeline.submit(handler, FakeMember(api, i), start=start) for i in range(joins)))
+    return pipeline.latency, api
+
+if __name__ == "__main__":
+    joins = int(argv[1]) if len(argv) > 1 else 100
+    concurrency = int(argv[2]) if len(argv) > 2 else 8
+    rtt = (float(argv[3]) if len(argv) > 3 else 50) / 1000
+    for name, coro in (
+        ("serial", serial(joins, rtt)),
+        ("unthrottled", pipelined(joins, rtt, joins, False)),
+        ("pipeline", pipelined(joins, rtt, concurrency)),
+    ):
+        latency, api = run(coro)
+        print(f"{name:<11}: {latency.summary()}, {api.calls} requests, {api.limited} rate limited")
@@ -0,0 +1,94 @@
+"""
+對外API呼叫優先排程測試。
+
+模擬大量通知訊息與使用者加入後之移動請求同時發生，
+比較所有呼叫同等處理(先到先處理)與依優先等級排程時，移動請求之等待延遲；
+並以通知訊息集中於同一頻道且受限流之情境，確認等待令牌之呼叫不會佔用空位；
+以及備用頻道補充與使用者加入共用同一創建頻道路由時，使用者之請求是否優先取得令牌。
+
+python -m benchmarks.rest_priority [notifications] [moves] [rtt_ms]
+"""
+from modules import LatencyRecorder
+from voice_operation import INTERACTIVE, LIFECYCLE, NOTIFICATION, RestScheduler
+
+from asyncio import create_task, gather, run, sleep
+from sys import argv
+from time import perf_counter
+
+# 客戶端限制(時間尺度經壓縮，以縮短測試時間)
+LIMITS = {
+    "send_message": (50, 1.0),
+    "move_member": (50, 1.0),
+}
+# 同一頻道之通知訊息受限流(每0.5秒5則)
+THROTTLED = {
+    "send_message": (5, 0.5),
+    "move_member": (50, 1.0),
+}
+# 同一群組之創建頻道受限流(每0.5秒2次)
+CREATE_LIMITS = {
+    "create_channel": (2, 0.5),
+}
+CONCURRENCY = 4
+
+async def burst(notifications: int, moves: int, rtt: float, prioritized: bool, limits: dict[str, tuple[int, float]], channels: int, delay: float) -> tuple[LatencyRecorder, LatencyRecorder]:
+    scheduler = RestScheduler(CONCURRENCY, limits)
+    move_latency, notice_latency = LatencyRecorder(), LatencyRecorder()
+
+    async def call(recorder: LatencyRecorder, start: float) -> None:
+        await sleep(rtt)
+        recorder.record(perf_counter() - start)
+
+    # 通知訊息先排入，移動請求於`delay`秒後抵達
+    tasks = [
+        create_task(scheduler.request(NOTIFICATION, "send_message", index % channels, call, notice_latency, perf_counter()))
+        for index in range(notifications)
+    ]
+    await sleep(delay)
+    priority = INTERACTIVE if prioritized else NOTIFICATION
+    tasks += [
+        create_task(scheduler.request(priority, "move_member", 0, call, move_latency, perf_counter()))
+        for _ in range(moves)
+    ]
+    await gather(*tasks)
+    return move_latency, notice_latency
+
+async def shared_route(spares: int, joins: int, rtt: float, prioritized: bool) -> tuple[LatencyRecorder, LatencyRecorder]:
+    scheduler = RestScheduler(CONCURRENCY, CREATE_LIMITS)
+    join_latency, spare_latency = LatencyRecorder(), LatencyRecorder()
+
+    async def call(recorder: LatencyRecorder, start: float) -> None:
+        await sleep(rtt)
+        recorder.record(perf_counter() - start)
+
+    # 備用頻道補充先排入，使用者加入隨後抵達
+    tasks = [
+        create_task(scheduler.request(LIFECYCLE, "create_channel", 0, call, spare_latency, perf_counter()))
+        for _ in range(spares)
+    ]
+    await sleep(0)
+    priority = INTERACTIVE if prioritized else LIFECYCLE
+    tasks += [
+        create_task(scheduler.request(priority, "create_channel", 0, call, join_latency, perf_counter()))
+        for _ in range(joins)
+    ]
+    await gather(*tasks)
+    return join_latency, spare_latency
+
+if __name__ == "__main__":
+    notifications = int(argv[1]) if len(argv) > 1 else 200
+    moves = int(argv[2]) if len(argv) > 2 else 20
+    rtt = (float(argv[3]) if len(argv) > 3 else 50) / 1000
+    cases = (
+        ("fifo", notifications, False, LIMITS, 8, 0),
+        ("priority", notifications, True, LIMITS, 8, 0),
+        # 移動請求於首批通知訊息完成後抵達，此時其餘通知訊息正等待令牌
+        ("throttled", 12, True, THROTTLED, 1, rtt * 1.5),
+    )
+    for name, count, prioritized, limits, channels, delay in cases:
+        move_latency, notice_latency = run(burst(count, moves, rtt, prioritized, limits, channels, delay))
+        print(f"{name:<9}: moves {move_latency.summary()}; notifications {notice_latency.summary()}")
+    # 同一路由內之優先順序
+    for name, prioritized in (("route fifo", False), ("route prio", True)):
+        join_latency, spare_latency = run(shared_route(8, 2, rtt, prioritized))
+        print(f"{name:<10}: joins {join_latency.summary()}; spares {spare_latency.summary()}")
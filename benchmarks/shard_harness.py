@@ -0,0 +1,108 @@
+"""
+多程序分片一致性測試。
+
+啟動兩個(或多個)程序模擬各自負責之分片，共用同一個SQLite資料庫，
+每個程序以記憶體快取(寫回)處理其群組之頻道事件，結束後比對資料庫內容與各程序之最終狀態，
+確認沒有任何修改因資料庫鎖定而遺失。
+
+python -m benchmarks.shard_harness [shards] [operations]
+"""
+import db_operation as dbo
+from db_operation import aio as adbo
+
+from asyncio import run, sleep
+from multiprocessing import get_context
+from os.path import join
+from random import Random
+from sys import argv
+from tempfile import TemporaryDirectory
+
+# 每個分片之群組數量與每個群組之頻道數量
+GUILDS_PER_SHARD = 4
+CHANNELS_PER_GUILD = 32
+# 刻意縮短等待鎖之時間，使重試機制被觸發
+PRAGMAS = {"busy_timeout": 20, "journal_mode": "wal", "synchronous": "normal"}
+
+Snapshot = dict[int, list[tuple[int, list[int], list[int], bool, int]]]
+
+def shard_guilds(shard_id: int, shards: int) -> list[int]:
+    # 群組ID之分片計算方式與Discord相同: (guild_id >> 22) % shard_count
+    return [((index * shards + shard_id) << 22) + 1 for index in range(GUILDS_PER_SHARD)]
+
+def normalize(rows) -> list[tuple[int, list[int], list[int], bool, int]]:
+    return sorted(
+        (channel_id, sorted(admin_list), sorted(ban_list), bool(no_admin), last_admin)
+        for channel_id, admin_list, ban_list, no_admin, last_admin in rows
+    )
+
+async def simulate(shard_id: int, guilds: list[int], operations: int) -> Snapshot:
+    store = dbo.ChannelStateStore(flush_interval=0.02, flush_threshold=8)
+    for guild_id in guilds:
+        await store.load(await adbo.database_init(guild_id))
+    store.start()
+
+    rng = Random(shard_id)
+    for step in range(operations):
+        guild_id = rng.choice(guilds)
+        channel_id = guild_id + rng.randrange(CHANNELS_PER_GUILD)
+        user_id = rng.randrange(1, 16)
+        action = rng.random()
+        if action < 0.05: store.delete_channel(guild_id, channel_id)
+        elif action < 0.40: store.add_admin(guild_id, channel_id, user_id)
+        elif action < 0.70: store.member_leave(guild_id, channel_id, user_id)
+        elif action < 0.85: store.add_ban(guild_id, channel_id, user_id)
+        else: store.remove_ban(guild_id, channel_id, user_id)
+        if step % 16 == 0: await sleep(0)
+    await store.stop()
+    adbo.EXECUTOR.shutdown()
+
+    snapshot: Snapshot = {}
+    for guild_id in guilds:
+        rows = []
+        for channel_id in store.channel_ids(guild_id):
+            state = store.get(guild_id, channel_id)
+            rows.append((channel_id, state.admin_list, state.ban_list, state.no_admin, state.last_admin))
+        snapshot[guild_id] = normalize(rows)
+    return snapshot
+
+def worker(path: str, shard_id: int, shards: int, operations: int, queue) -> None:
+    dbo.POOL.configure(path, "thread", PRAGMAS, retries=20)
+    dbo.use_backend("sqlite")
+    # 所有程序同時檢查並遷移資料庫結構
+    dbo.get_backend().migrate()
+    snapshot = run(simulate(shard_id, shard_guilds(shard_id, shards), operations))
+    dbo.get_backend().close()
+    queue.put((shard_id, snapshot))
+
+def main(shards: int, operations: int) -> bool:
+    context = get_context("spawn")
+    queue = context.Queue()
+    with TemporaryDirectory() as dir_path:
+        path = join(dir_path, "shards.db")
+        processes = [
+            context.Process(target=worker, args=(path, shard_id, shards, operations, queue), name=f"Shard-{shard_id}")
+            for shard_id in range(shards)
+        ]
+        for process in processes: process.start()
+        results = dict(queue.get() for _ in processes)
+        for process in processes: process.join()
+
+        dbo.POOL.configure(path, "none", PRAGMAS)
+        ok = True
+        for shard_id, snapshot in sorted(results.items()):
+            lost = 0
+            for guild_id, expected in snapshot.items():
+                actual = normalize(dbo.get_channels(guild_id))
+                if actual != expected:
+                    lost += len(set(map(repr, expected)) ^ set(map(repr, actual)))
+            channels = sum(map(len, snapshot.values()))
+            print(f"shard {shard_id}: {len(snapshot)} guilds, {channels} channels, {lost} mismatched rows")
+            ok = ok and lost == 0
+        dbo.POOL.close()
+    print("OK" if ok else "LOST UPDATES")
+    return ok
+
+if __name__ == "__main__":
+    shards = int(argv[1]) if len(argv) > 1 else 2
+    operations = int(argv[2]) if len(argv) > 2 else 5000
+    exit(0 if main(shards, operations) else 1)
@@ -1,17 +1,19 @@
 from configs import DISCORD_PREFIXS, DISCORD_LOGGER as LOG, TIMEZONE
 import db_operation as dbo
+from modules import Pipeline
+import voice_operation as vo
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
-from discord import Member, Message, VoiceChannel, Embed
+from discord import ApplicationContext, Forbidden, Guild, HTTPException, Member, Message, Role, VoiceChannel, Embed
 
-def _is_admin(table_name: str, channel: VoiceChannel, user: Member) -> bool:
+async def _is_admin(guild_key: int, channel: VoiceChannel, user: Member) -> bool:
     """
     檢查使用者是否為該頻道之管理員。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_key: :class:`int`
+        該群組於資料庫中之鍵值。
     channel: :class:`VoiceChannel`
         該頻道。
     user: :class:`Member`
@@ -20,67 +22,105 @@ def _is_admin(table_name: str, channel: VoiceChannel, user: Member) -> bool:
     return: :class:`bool`
         是否為管理員。
     """
-    # 取得管理員清單
-    admin_list = dbo.get_admin(table_name, channel.id)
-    # 檢查是否為管理員
-    if user.id not in admin_list:
-        # 如果不是管理員
-        return False
-    # 如果是管理員
-    return True
-
-def _help_embed_generator(
-    author: Member,
-    title: str,
-    format_: str,
-    intro: list[str],
-    args: list[str],
-    example: list[str]
-) -> Embed:
-    """
-    幫助Embed生成器。
+    # 檢查是否為管理員，群組資料未載入時自資料庫讀取
+    return await dbo.STATE.authorize(guild_key, channel.id, user.id)
+
+# Embed模板已設定之屬性，以模板之`id`為鍵值
+_TEMPLATE_SLOTS: dict[int, tuple[tuple[str, object]]] = {}
 
+def _stamp(template: Embed, author: Member, description: Optional[str]=None) -> Embed:
+    """
+    複製Embed模板並填入作者與時間。
+
+    template: :class:`Embed`
+        Embed模板。
     author: :class:`Member`
         作者。
-    title: :class:`str`
-        指令名稱。
-    format_: :class:`str`
-        指令格式。
-    intro: :class:`list[str]`
-        指令說明。
-    args: :class:`list[str]`
-        指令參數說明。
-    example: :class:`list[str]`
-        指令範例。
+    description: :class:`str | None`
+        訊息內容，`None`表示使用模板之內容。
 
     return: :class:`Embed`
         生成之Embed。
     """
+    # 僅重新指定內容、時間與作者，不修改模板之欄位，因此直接複製模板已設定之屬性即可
+    # (`Embed.copy`會經由`to_dict`/`from_dict`重建整個Embed，較重新建立更慢)
+    slots = _TEMPLATE_SLOTS.get(id(template))
+    if slots == None:
+        slots = _TEMPLATE_SLOTS[id(template)] = tuple(
+            (name, getattr(template, name)) for name in Embed.__slots__ if hasattr(template, name)
+        )
+    embed = Embed.__new__(Embed)
+    for name, value in slots: setattr(embed, name, value)
+    if description != None: embed.description = description
+    embed.timestamp = datetime.now(TIMEZONE)
+    # 作者
+    embed.set_author(
+        name=author.display_name,
+        icon_url=author.display_avatar.url
+    )
+    return embed
+
+# 固定內容之Embed模板
+_NOT_ADMIN_TEMPLATE = Embed(color=0xff0000, title="發生錯誤!", description="你不是本頻道的管理員。")
+_NOT_DVC_TEMPLATE = Embed(color=0xff0000, title="發生錯誤!", description="你不在動態語音頻道內。")
+_ERROR_TEMPLATE = Embed(color=0xff0000, title="發生錯誤!")
+_SUCCESS_TEMPLATE = Embed(color=0x00ff00, title="命令執行成功")
+
+def _help_template(command: type["BaseCommand"]) -> Embed:
+    """
+    依指令說明產生說明Embed模板。
+
+    command: :class:`type[BaseCommand]`
+        指令。
+
+    return: :class:`Embed`
+        Embed模板。
+    """
     _e_prefix = DISCORD_PREFIXS[0] # 指令開頭
     embed = Embed(
         color=0xffc800,
-        title=f"指令說明 - `{title}`",
-        timestamp=datetime.now(TIMEZONE),
+        title=f"指令說明 - `{command.name}`",
     )
     embed.description = "\n".join([
         f"指令有效開頭:`{'|'.join(DISCORD_PREFIXS)}`",
-        f"格式 - `{format_}`",
+        f"格式 - `{command.usage}`",
     ])
     # 指令說明
-    intro = map(lambda in_str: f"> {in_str}", intro)
-    embed.add_field(name="說明", value="\n".join(intro), inline= False)
-    if len(args) != 0:
+    embed.add_field(name="說明", value="\n".join(f"> {line}" for line in command.intro), inline= False)
+    if len(command.arguments) != 0:
         # 指令參數說明
-        args = map(lambda in_str: f"> {in_str}", args)
-        embed.add_field(name="參數", value="\n".join(args), inline= False)
+        embed.add_field(name="參數", value="\n".join(f"> {line}" for line in command.arguments), inline= False)
     # 指令範例
-    example = map(lambda in_str: f"> `{_e_prefix}{in_str}`", example)
-    embed.add_field(name="範例", value="\n".join(example), inline= False)
-    # 作者
-    embed.set_author(
-        name=author.display_name,
-        icon_url=author.display_avatar.url
+    embed.add_field(name="範例", value="\n".join(f"> `{_e_prefix}{line}`" for line in command.examples), inline= False)
+    return embed
+
+def _overview_template(commands: list[type["BaseCommand"]]) -> Embed:
+    """
+    依指令分類產生指令總覽Embed模板。
+
+    commands: :class:`list[type[BaseCommand]]`
+        所有指令。
+
+    return: :class:`Embed`
+        Embed模板。
+    """
+    embed = Embed(
+        color=0xffc800,
+        title="指令說明 - `help`",
     )
+    embed.description = "\n".join([
+        f"指令有效開頭:`{'|'.join(DISCORD_PREFIXS)}`",
+        f"可使用`help <command>`獲得詳細說明",
+    ])
+    # 依分類排列，並對齊各指令之說明
+    categories: dict[str, list[type[BaseCommand]]] = {}
+    for command in commands:
+        if command.category: categories.setdefault(command.category, []).append(command)
+    for category, members in categories.items():
+        width = max(len(command.usage) for command in members) + 2
+        embed.add_field(name=category, value="\n".join(
+            f"> {f'`{command.usage}`':<{width}} - {command.description}" for command in members
+        ), inline= False)
     return embed
 
 def _not_admin_embed_generator(author: Member) -> Embed:
@@ -93,18 +133,19 @@ def _not_admin_embed_generator(author: Member) -> Embed:
     return: :class:`Embed`
         生成之Embed。
     """
-    embed = Embed(
-        color=0xff0000,
-        title="發生錯誤!",
-        description="你不是本頻道的管理員。",
-        timestamp=datetime.now(TIMEZONE)
-    )
-    # 作者
-    embed.set_author(
-        name=author.display_name,
-        icon_url=author.display_avatar.url
-    )
-    return embed
+    return _stamp(_NOT_ADMIN_TEMPLATE, author)
+
+def _not_dvc_embed_generator(author: Member) -> Embed:
+    """
+    不是動態語音頻道Embed生成器。
+
+    author: :class:`Member`
+        作者。
+
+    return: :class:`Embed`
+        生成之Embed。
+    """
+    return _stamp(_NOT_DVC_TEMPLATE, author)
 
 def _format_error_embed_generator(author: Member, command: str) -> Embed:
     """
@@ -118,18 +159,7 @@ def _format_error_embed_generator(author: Member, command: str) -> Embed:
     return: :class:`Embed`
         生成之Embed。
     """
-    embed = Embed(
-        color=0xff0000,
-        title="發生錯誤!",
-        description=f"格式錯誤，請使用`help {command}`取得詳細說明。",
-        timestamp=datetime.now(TIMEZONE)
-    )
-    # 作者
-    embed.set_author(
-        name=author.display_name,
-        icon_url=author.display_avatar.url
-    )
-    return embed
+    return _stamp(_ERROR_TEMPLATE, author, f"格式錯誤，請使用`help {command}`取得詳細說明。")
 
 def _success_embed_generator(author: Member, message: str) -> Embed:
     """
@@ -143,138 +173,262 @@ def _success_embed_generator(author: Member, message: str) -> Embed:
     return: :class:`Embed`
         生成之Embed。
     """
-    embed = Embed(
-        color=0x00ff00,
-        title="命令執行成功",
-        description=message,
-        timestamp=datetime.now(TIMEZONE)
-    )
-    # 作者
-    embed.set_author(
-        name=author.display_name,
-        icon_url=author.display_avatar.url
-    )
-    return embed
+    return _stamp(_SUCCESS_TEMPLATE, author, message)
+
+class ArgumentError(ValueError):
+    """
+    指令參數格式錯誤。
+    """
+
+def _failure_reason(exc: Exception) -> str:
+    """
+    取得批次操作失敗之原因說明。
+
+    exc: :class:`Exception`
+        例外。
+
+    return: :class:`str`
+    """
+    if isinstance(exc, ArgumentError): return str(exc)
+    elif isinstance(exc, Forbidden): return "權限不足。"
+    elif isinstance(exc, HTTPException): return "Discord API錯誤。"
+    return "執行失敗。"
+
+def _batch_embed_generator(author: Member, action: str, succeeded: list[Member], failed: list[tuple[Member, Exception]]) -> Embed:
+    """
+    批次執行結果Embed生成器，分別列出成功與失敗之成員。
+
+    author: :class:`Member`
+        作者。
+    action: :class:`str`
+        動作說明。
+    succeeded: :class:`list[Member]`
+        成功之成員。
+    failed: :class:`list[tuple[Member, Exception]]`
+        失敗之成員與例外。
+
+    return: :class:`Embed`
+        生成之Embed。
+    """
+    lines = []
+    if len(succeeded) != 0:
+        lines.append(f"執行成功，已將{'、'.join(f'`{member.display_name}`' for member in succeeded)}{action}。")
+    for member, exc in failed:
+        lines.append(f"`{member.display_name}` - {_failure_reason(exc)}")
+    return _stamp(_SUCCESS_TEMPLATE if len(succeeded) != 0 else _ERROR_TEMPLATE, author, "\n".join(lines))
+
+def _log_batch(action: str, channel: VoiceChannel, succeeded: list[Member], failed: list[tuple[Member, Exception]]) -> None:
+    """
+    記錄批次執行結果。
+    """
+    if len(succeeded) != 0:
+        members_log = [f"user<{member.id}>" for member in succeeded]
+        LOG.info(f"{action} {','.join(members_log)} from channel<{channel.guild.id}/{channel.id}>.")
+    for member, exc in failed:
+        if isinstance(exc, ArgumentError): continue
+        LOG.warning(f"{action} user<{member.id}> from channel<{channel.guild.id}/{channel.id}> failed: {exc!r}.")
+
+def _parse_number(args: Optional[tuple]) -> int:
+    """
+    將第一個參數解析為整數，可為整數或運算式。
+
+    args: :class:`tuple | None`
+        原始參數。
+
+    return: :class:`int`
+    """
+    # 檢查是否有參數傳入
+    if args == None or len(args) < 1: raise ArgumentError
+    # 檢查是否可轉型為整數
+    try: return int(args[0])
+    except ValueError: pass
+    # 如果不是，則檢查是否為運算式
+    try: return int(eval(args[0]))
+    except: raise ArgumentError
+
+def _mention_decode(guild: Guild, raw_text: str) -> tuple[Member]:
+    """
+    將文字中之使用者標註轉換為成員。
+
+    guild: :class:`Guild`
+        群組。
+    raw_text: :class:`str`
+        原始文字。
+
+    return: :class:`tuple[Member]`
+    """
+    result = []
+    for tag in raw_text.split(">"):
+        if "@" not in tag: continue
+        try: user_id = int(tag.strip().strip("<@!"))
+        except ValueError: continue
+        member = guild.get_member(user_id)
+        if member != None: result.append(member)
+    return tuple(result)
+
+def _parse_members(raw_message: Message, args: Optional[tuple]) -> tuple[Member]:
+    """
+    取得指令所標註之成員，訊息指令使用其標註，斜線指令則解析參數文字。
+
+    return: :class:`tuple[Member]`
+    """
+    if hasattr(raw_message, "mentions"): members = tuple(raw_message.mentions)
+    elif args == None: members = ()
+    else: members = _mention_decode(raw_message.guild, " ".join(args))
+    if len(members) == 0: raise ArgumentError
+    return members
+
+# 隱私設定，對@everyone之權限
+PRIVACY_PROFILES: dict[str, dict[str, Optional[bool]]] = {
+    "private": {"view_channel": False, "connect": False, "speak": None},
+    "open": {"view_channel": None, "connect": None, "speak": None},
+    "stage": {"view_channel": None, "connect": None, "speak": False},
+}
+# 驅逐與解除驅逐之權限
+BAN_PERMISSIONS: dict[str, Optional[bool]] = {
+    "read_message_history": False,
+    "send_messages": False,
+    "connect": False,
+    "view_channel": False,
+}
+UNBAN_PERMISSIONS: dict[str, Optional[bool]] = dict.fromkeys(BAN_PERMISSIONS, None)
+
+async def apply_overwrite(channel: VoiceChannel, target: Union[Member, Role], permissions: dict[str, Optional[bool]]) -> int:
+    """
+    以單次API呼叫套用單一對象之權限修改，若無任何變更則不呼叫。
+    保留該對象其餘已設定之權限，且不會覆蓋其他對象之權限。
+
+    channel: :class:`VoiceChannel`
+        頻道。
+    target: :class:`Member | Role`
+        對象。
+    permissions: :class:`dict[str, bool | None]`
+        權限修改。
+
+    return: :class:`int`
+        實際變更之權限數量。
+    """
+    overwrite = channel.overwrites_for(target)
+    changed = sum(getattr(overwrite, key) != value for key, value in permissions.items())
+    if changed == 0: return 0
+    overwrite.update(**permissions)
+    # 已無任何設定時移除該覆寫
+    await vo.SCHEDULER.request(vo.INTERACTIVE, "edit_channel", channel.id, channel.set_permissions, target, overwrite=None if overwrite.is_empty() else overwrite)
+    return changed
+
+async def apply_privacy(channel: VoiceChannel, profile: str) -> int:
+    """
+    套用隱私設定。
+
+    channel: :class:`VoiceChannel`
+        頻道。
+    profile: :class:`str`
+        設定名稱，見`PRIVACY_PROFILES`。
+
+    return: :class:`int`
+        實際變更之權限數量，即逐一設定所需之API呼叫次數。
+    """
+    return await apply_overwrite(channel, channel.guild.default_role, PRIVACY_PROFILES[profile])
+
+# 指令名稱(含別名)對應至指令類別
+COMMANDS: dict[str, type["BaseCommand"]] = {}
+
+def get_command(name: str) -> Optional[type["BaseCommand"]]:
+    """
+    以名稱或別名取得指令。
+
+    name: :class:`str`
+        指令名稱。
+
+    return: :class:`type[BaseCommand] | None`
+        指令類別，若不存在則為`None`。
+    """
+    return COMMANDS.get(name)
 
 class BaseCommand:
+    """
+    指令基礎類別，子類別將以`name`與`aliases`自動註冊至`COMMANDS`。
+    """
+    name: str = ""
+    aliases: tuple[str] = ()
+    require_admin: bool = True
+    # 指令說明，用於產生說明Embed模板
+    category: str = ""
+    description: str = ""
+    usage: str = ""
+    intro: tuple[str] = ()
+    arguments: tuple[str] = ()
+    examples: tuple[str] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for key in (cls.name, *cls.aliases):
+            if key in COMMANDS: raise ValueError(f"Command `{key}` already registered.")
+            COMMANDS[key] = cls
+
+    @classmethod
+    async def help(cls, raw_message: Message) -> dict:
+        return {"embed": _stamp(_HELP_TEMPLATES[cls], raw_message.author)}
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        raise NotImplementedError
-    
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> Optional[tuple]:
+        """
+        將原始參數轉換為指令所需之參數，格式錯誤時引發`ArgumentError`。
+        """
+        return args
+
     @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         raise NotImplementedError
 
 class Help(BaseCommand):
+    name = "help"
+    aliases = ("h",)
+    require_admin = False
+    description = "指令說明"
+    usage = "help <command>"
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        author = raw_message.author # 訊息發送者
-        embed = Embed(
-            color=0xffc800,
-            title="指令說明 - `help`",
-            timestamp=datetime.now(TIMEZONE),
-        )
-        embed.description = "\n".join([
-            f"指令有效開頭:`{'|'.join(DISCORD_PREFIXS)}`",
-            f"可使用`help <command>`獲得詳細說明",
-        ])
-        embed.add_field(name="基礎設定", value="\n".join([
-            f"> `name <name>`   - 改變你的語音頻道名稱",
-            f"> `limit <num>`   - 改變頻道限制人數",
-            f"> `bitrate <num>` - 改變頻道的位元率",
-        ]), inline= False)
-        embed.add_field(name="隱私相關設定", value="\n".join([
-            f"> `hide`   - 將語音頻道隱藏，其他使用者無法看見該頻道",
-            f"> `unhide` - 將語音頻道設為可見",
-            f"> `lock`   - 將頻道上鎖，其他使用者無法加入",
-            f"> `unlock` - 將頻道解鎖，其他使用者可以加入",
-        ]), inline= False)
-        embed.add_field(name="管理參與者", value="\n".join([
-            f"> `kick <tag>`  - 踢出語音頻道內的某個使用者",
-            f"> `ban <tag>`   - 驅逐某個使用者",
-            f"> `unban <tag>` - 解除驅逐某個使用者",
-        ]), inline= False)
-        embed.add_field(name="管理頻道", value="\n".join([
-            f"> `mute`              - 禁止所有人說話",
-            f"> `unmute`            - 允許所有人說話",
-            f"> `chmod <mod> <tag>` - 管理個別使用者之權限",
-        ]), inline= False)
-        embed.set_author(
-            name=author.display_name,
-            icon_url=author.display_avatar.url
-        )
-        return {"embed": embed}
-    
-    @staticmethod
-    async def execute(tabel_nam: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
-        if args == None: return await Help.help(raw_message)
-        elif args[0] == "name":
-            return await Name.help(raw_message)
-        elif args[0] == "limit":
-            return await Limit.help(raw_message)
-        elif args[0] == "bitrate":
-            return await BitRate.help(raw_message)
-        elif args[0] == "hide":
-            return await Hide.help(raw_message)
-        elif args[0] == "unhide":
-            return await UnHide.help(raw_message)
-        elif args[0] == "lock":
-            return await Lock.help(raw_message)
-        elif args[0] == "unlock":
-            return await UnLock.help(raw_message)
-        elif args[0] == "kick":
-            return await Kick.help(raw_message)
-        elif args[0] == "ban":
-            return await Ban.help(raw_message)
-        elif args[0] == "unban":
-            return await UnBan.help(raw_message)
-        else:
-            return await Help.help(raw_message)
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
+        if args == None or len(args) == 0: return await Help.help(raw_message)
+        # 查詢指令，不存在時顯示所有指令
+        command = get_command(args[0].lower())
+        if command == None: command = Help
+        return await command.help(raw_message)
 
 class Name(BaseCommand):
+    name = "name"
+    category = "基礎設定"
+    description = "改變你的語音頻道名稱"
+    usage = "name <name>"
+    # 指令說明
+    intro = (
+        "將頻道名稱更改為`<name>`。",
+    )
+    # 指令參數說明
+    arguments = (
+        "`<name>` - 字串，新的頻道名稱。",
+    )
+    # 指令範例
+    examples = (
+        "name New_Channel_Name",
+        "name new name",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道名稱更改為`<name>`。",
-        ]
-        # 指令參數說明
-        args = [
-            "`<name>` - 字串，新的頻道名稱。",
-        ]
-        # 指令範例
-        example = [
-            "name New_Channel_Name",
-            "name new name",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="name",
-            format_="name <name>",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> tuple:
+        # 檢查是否有參數傳入
+        if args == None or len(args) < 1: raise ArgumentError
+        return (" ".join(args),)
+
     @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-
-        # 檢查是否有參數傳入
-        if args == None or len(args) < 1:
-            return {"embed": _format_error_embed_generator(author, "name")}
-
         # 執行指令
         origin_name = channel.name
-        new_name = " ".join(args)
-        await channel.edit(name=new_name)
+        new_name = args[0]
+        await vo.SCHEDULER.request(vo.INTERACTIVE, "edit_channel", channel.id, channel.edit, name=new_name)
         LOG.info(f"Edit channel<{channel.guild.id}/{channel.id}> name from `{origin_name}` to `{channel.name}`.")
         return {"embed": _success_embed_generator(
             author=author,
@@ -282,62 +436,36 @@ class Name(BaseCommand):
         )}
 
 class Limit(BaseCommand):
+    name = "limit"
+    category = "基礎設定"
+    description = "改變頻道限制人數"
+    usage = "limit <num>"
+    # 指令說明
+    intro = (
+        "將頻道人數上限更改為`<num>`人。",
+    )
+    # 指令參數說明
+    arguments = (
+        "`<num>` - 整數或運算式，人數上限。",
+    )
+    # 指令範例
+    examples = (
+        "limit 10",
+        "limit (7+8*6)/5-1",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道人數上限更改為`<num>`人。",
-        ]
-        # 指令參數說明
-        args = [
-            "`<num>` - 整數或運算式，人數上限。",
-        ]
-        # 指令範例
-        example = [
-            "limit 10",
-            "limit (7+8*6)/5-1",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="limit",
-            format_="limit <num>",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> tuple:
+        return (abs(_parse_number(args)),)
+
     @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
-        # 檢查是否有參數傳入
-        if args == None or len(args) < 1:
-            return {"embed": _format_error_embed_generator(author, "limit")}
-        else:
-            # 如果有，則檢查是否可以轉為有效參數
-            # 檢查是否可轉型為整數
-            result = None
-            try: result = int(args[0])
-            except ValueError:
-                # 如果不是，則檢查是否為運算式
-                try: result = eval(args[0])
-                except: pass
-            # 檢查是否為有效參數
-            if result == None:
-                return {"embed": _format_error_embed_generator(author, "limit")}
-            # 如果是，則進行修飾
-            result = abs(int(result))
-        
+        result = args[0]
         # 則執行指令
         origin_limit = channel.user_limit
-        await channel.edit(user_limit=result)
+        await vo.SCHEDULER.request(vo.INTERACTIVE, "edit_channel", channel.id, channel.edit, user_limit=result)
         LOG.info(f"Edit channel<{channel.guild.id}/{channel.id}> limit from `{origin_limit}`to `{channel.user_limit}`.")
         return {"embed": _success_embed_generator(
             author=author,
@@ -345,63 +473,37 @@ class Limit(BaseCommand):
         )}
 
 class BitRate(BaseCommand):
+    name = "bitrate"
+    aliases = ("br",)
+    category = "基礎設定"
+    description = "改變頻道的位元率"
+    usage = "bitrate <num>"
+    # 指令說明
+    intro = (
+        "將頻道位元率更改為`<num>`kbps。",
+    )
+    # 指令參數說明
+    arguments = (
+        "`<num>` - 整數或運算式，位元率。",
+    )
+    # 指令範例
+    examples = (
+        "bitrate 64",
+        "bitrate 8**3/8",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道位元率更改為`<num>`kbps。",
-        ]
-        # 指令參數說明
-        args = [
-            "`<num>` - 整數或運算式，位元率。",
-        ]
-        # 指令範例
-        example = [
-            "limit 64",
-            "limit 8**3/8",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="bitrate",
-            format_="bitrate <num>",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> tuple:
+        return (min(96, max(_parse_number(args), 8)),)
+
     @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
-        # 檢查是否有參數傳入
-        if args == None or len(args) < 1:
-            return {"embed": _format_error_embed_generator(author, "bitrate")}
-        else:
-            # 如果有，則檢查是否可以轉為有效參數
-            # 檢查是否可轉型為整數
-            result = None
-            try: result = int(args[0])
-            except ValueError:
-                # 如果不是，則檢查是否為運算式
-                try: result = eval(args[0])
-                except: pass
-            # 檢查是否為有效參數
-            if result == None:
-                return {"embed": _format_error_embed_generator(author, "bitrate")}
-            # 如果是，則進行修飾
-            result = max(int(result), 8)
-            result = min(96, result)
-        
+        result = args[0]
         # 則執行指令
         origin_bitrate = channel.bitrate
-        await channel.edit(bitrate=result)
+        await vo.SCHEDULER.request(vo.INTERACTIVE, "edit_channel", channel.id, channel.edit, bitrate=result)
         LOG.info(f"Edit channel<{channel.guild.id}/{channel.id}> bitrate from `{origin_bitrate}kbps`to `{channel.bitrate}kbps`.")
         return {"embed": _success_embed_generator(
             author=author,
@@ -409,41 +511,26 @@ class BitRate(BaseCommand):
         )}
 
 class Hide(BaseCommand):
+    name = "hide"
+    category = "隱私相關設定"
+    description = "將語音頻道隱藏，其他使用者無法看見該頻道"
+    usage = "hide"
+    # 指令說明
+    intro = (
+        "將頻道隱藏，其他使用者將無法看到本頻道。",
+    )
+    # 指令範例
+    examples = (
+        "hide",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道隱藏，其他使用者將無法看到本頻道。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "hide",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="hide",
-            format_="hide",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
-    @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
         # 則執行指令
         everyone_role = channel.guild.default_role
-        await channel.set_permissions(everyone_role, view_channel=False)
+        await apply_overwrite(channel, everyone_role, {"view_channel": False})
         LOG.info(f"Hide channel<{channel.guild.id}/{channel.id}>.")
         return {"embed": _success_embed_generator(
             author=author,
@@ -451,41 +538,26 @@ class Hide(BaseCommand):
         )}
 
 class UnHide(BaseCommand):
+    name = "unhide"
+    category = "隱私相關設定"
+    description = "將語音頻道設為可見"
+    usage = "unhide"
+    # 指令說明
+    intro = (
+        "將頻道解除隱藏，其他使用者將可以看到本頻道。",
+    )
+    # 指令範例
+    examples = (
+        "unhide",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道解除隱藏，其他使用者將可以看到本頻道。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "unhide",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="unhide",
-            format_="unhide",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
-    @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
         # 則執行指令
         everyone_role = channel.guild.default_role
-        await channel.set_permissions(everyone_role, view_channel=None)
+        await apply_overwrite(channel, everyone_role, {"view_channel": None})
         LOG.info(f"Unhide channel<{channel.guild.id}/{channel.id}>.")
         return {"embed": _success_embed_generator(
             author=author,
@@ -493,41 +565,26 @@ class UnHide(BaseCommand):
         )}
 
 class Lock(BaseCommand):
+    name = "lock"
+    category = "隱私相關設定"
+    description = "將頻道上鎖，其他使用者無法加入"
+    usage = "lock"
+    # 指令說明
+    intro = (
+        "將頻道上鎖，其他使用者將無法連接至本頻道。",
+    )
+    # 指令範例
+    examples = (
+        "lock",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道上鎖，其他使用者將無法連接至本頻道。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "lock",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="lock",
-            format_="lock",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
-    @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
         # 則執行指令
         everyone_role = channel.guild.default_role
-        await channel.set_permissions(everyone_role, connect=False)
+        await apply_overwrite(channel, everyone_role, {"connect": False})
         LOG.info(f"Lock channel<{channel.guild.id}/{channel.id}>.")
         return {"embed": _success_embed_generator(
             author=author,
@@ -535,242 +592,203 @@ class Lock(BaseCommand):
         )}
 
 class UnLock(BaseCommand):
+    name = "unlock"
+    category = "隱私相關設定"
+    description = "將頻道解鎖，其他使用者可以加入"
+    usage = "unlock"
+    # 指令說明
+    intro = (
+        "將頻道解鎖，其他使用者將可以連接至本頻道。",
+    )
+    # 指令範例
+    examples = (
+        "unlock",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道解鎖，其他使用者將無法連接至本頻道。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "unlock",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="unlock",
-            format_="unlock",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
-    @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
         # 則執行指令
         everyone_role = channel.guild.default_role
-        await channel.set_permissions(everyone_role, connect=None)
+        await apply_overwrite(channel, everyone_role, {"connect": None})
         LOG.info(f"Unlock channel<{channel.guild.id}/{channel.id}>.")
         return {"embed": _success_embed_generator(
             author=author,
             message=f"修改成功，已將頻道解鎖。"
         )}
 
-class Kick(BaseCommand):
+class Privacy(BaseCommand):
+    name = "privacy"
+    category = "隱私相關設定"
+    description = "一次套用頻道之隱私設定"
+    usage = "privacy <profile>"
+    # 指令說明
+    intro = (
+        "一次套用多項隱私設定，僅需一次修改。",
+    )
+    # 指令參數說明
+    arguments = (
+        "`<profile>` - `private`(隱藏並上鎖)、`open`(公開)或`stage`(僅能聆聽)。",
+    )
+    # 指令範例
+    examples = (
+        "privacy private",
+        "privacy stage",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將使用者從頻道中踢出。",
-            "備註:只要有被Tag到的使用者都會被踢出。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "kick <@302774180611358720>",
-            "kick <@302774180611358720> <@859360640626589696> <@844207119296364594>",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="kcik",
-            format_="kick <@tag>",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> tuple:
+        # 檢查是否為有效設定
+        if args == None or len(args) < 1 or args[0].lower() not in PRIVACY_PROFILES: raise ArgumentError
+        return (args[0].lower(),)
+
     @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
+        profile = args[0]             # 設定名稱
         # 則執行指令
-        if hasattr(raw_message, "mentions"): members = raw_message.mentions
-        else: members = args
-        for member in members:
-            await member.move_to(None)
-        members_name = [f"`{member.display_name}`" for member in members]
-        members_log = [f"user<{member.id}>" for member in members]
-        LOG.info(f"Kick {','.join(members_log)} from channel<{channel.guild.id}/{channel.id}>.")
+        changed = await apply_privacy(channel, profile)
+        if changed == 0:
+            return {"embed": _success_embed_generator(
+                author=author,
+                message=f"頻道已是`{profile}`設定，無需修改。"
+            )}
+        LOG.info(f"Apply privacy profile `{profile}` to channel<{channel.guild.id}/{channel.id}>, {changed - 1} calls saved.")
         return {"embed": _success_embed_generator(
             author=author,
-            message=f"執行成功，已將{'、'.join(members_name)}自頻道踢出。"
+            message=f"修改成功，已套用`{profile}`設定，以1次修改取代{changed}次，節省{changed - 1}次API呼叫。"
         )}
 
+class Kick(BaseCommand):
+    name = "kick"
+    category = "管理參與者"
+    description = "踢出語音頻道內的某個使用者"
+    usage = "kick <@tag>"
+    # 指令說明
+    intro = (
+        "將使用者從頻道中踢出。",
+        "備註:只要有被Tag到的使用者都會被踢出。",
+    )
+    # 指令範例
+    examples = (
+        "kick <@302774180611358720>",
+        "kick <@302774180611358720> <@859360640626589696> <@844207119296364594>",
+    )
+
+    @staticmethod
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> tuple:
+        return _parse_members(raw_message, args)
+
+    @staticmethod
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
+        channel = raw_message.channel # 頻道
+        author = raw_message.author   # 訊息發送者
+
+        async def kick(member: Member) -> None:
+            # 僅踢出在本頻道內之使用者
+            if member.voice == None or member.voice.channel != channel: raise ArgumentError("不在本頻道內。")
+            await vo.SCHEDULER.request(vo.INTERACTIVE, "move_member", channel.guild.id, member.move_to, None)
+
+        # 則執行指令
+        succeeded, failed = await vo.BATCH.run(args, kick)
+        _log_batch("Kick", channel, succeeded, failed)
+        return {"embed": _batch_embed_generator(author, "自頻道踢出", succeeded, failed)}
+
 class Ban(BaseCommand):
+    name = "ban"
+    category = "管理參與者"
+    description = "驅逐某個使用者"
+    usage = "ban <@tag>"
+    # 指令說明
+    intro = (
+        "將使用者從頻道中驅逐，在解除驅逐以前皆無法再次連接至頻道。",
+        "備註:只要有被Tag到的使用者都會被驅逐。",
+    )
+    # 指令範例
+    examples = (
+        "ban <@302774180611358720>",
+        "ban <@302774180611358720> <@859360640626589696> <@844207119296364594>",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將使用者從頻道中驅逐，在解除驅逐以前皆無法再次連接至頻道。",
-            "備註:只要有被Tag到的使用者都會被驅逐。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "ban <@302774180611358720>",
-            "ban <@302774180611358720> <@859360640626589696> <@844207119296364594>",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="ban",
-            format_="ban <@tag>",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> tuple:
+        return _parse_members(raw_message, args)
+
     @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
+
+        async def ban(member: Member) -> None:
+            if member == author: raise ArgumentError("你無法驅逐你自己。")
+            # 先移除權限，避免使用者於移出後立即重新加入
+            await apply_overwrite(channel, member, BAN_PERMISSIONS)
+            dbo.STATE.add_ban(guild_key, channel.id, member.id)
+            if member.voice != None and member.voice.channel == channel:
+                await vo.SCHEDULER.request(vo.INTERACTIVE, "move_member", channel.guild.id, member.move_to, None)
+
         # 則執行指令
-        if hasattr(raw_message, "mentions"): members = raw_message.mentions
-        else: members = args
-        for member in members:
-            if member == author:
-                await raw_message.reply("你無法驅逐你自己。")
-                members.remove(member)
-                continue
-            await member.move_to(None)
-            await channel.set_permissions(member,
-                read_message_history=False,
-                send_messages=False,
-                connect=False,
-                view_channel=False
-            )
-        members_name = [f"`{member.display_name}`" for member in members]
-        members_log = [f"user<{member.id}>" for member in members]
-        LOG.info(f"Ban {','.join(members_log)} from channel<{channel.guild.id}/{channel.id}>.")
-        return {"embed": _success_embed_generator(
-            author=author,
-            message=f"執行成功，已將{'、'.join(members_name)}自頻道驅逐。"
-        )}
+        succeeded, failed = await vo.BATCH.run(args, ban)
+        _log_batch("Ban", channel, succeeded, failed)
+        return {"embed": _batch_embed_generator(author, "自頻道驅逐", succeeded, failed)}
 
 class UnBan(BaseCommand):
+    name = "unban"
+    category = "管理參與者"
+    description = "解除驅逐某個使用者"
+    usage = "unban <@tag>"
+    # 指令說明
+    intro = (
+        "將解除驅逐使用者。",
+        "備註:只要有被Tag到的使用者都會被解除驅逐。",
+    )
+    # 指令範例
+    examples = (
+        "unban <@302774180611358720>",
+        "unban <@302774180611358720> <@859360640626589696> <@844207119296364594>",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將解除驅逐使用者。",
-            "備註:只要有被Tag到的使用者都會被解除驅逐。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "unban <@302774180611358720>",
-            "unban <@302774180611358720> <@859360640626589696> <@844207119296364594>",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="unban",
-            format_="unban <@tag>",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
+    def parse(raw_message: Message, args: Optional[tuple]=None) -> tuple:
+        return _parse_members(raw_message, args)
+
     @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
+
+        async def unban(member: Member) -> None:
+            await apply_overwrite(channel, member, UNBAN_PERMISSIONS)
+            dbo.STATE.remove_ban(guild_key, channel.id, member.id)
+
         # 則執行指令
-        if hasattr(raw_message, "mentions"): members = raw_message.mentions
-        else: members = args
-        for member in members:
-            await channel.set_permissions(member,
-                read_message_history=None,
-                send_messages=None,
-                connect=None,
-                view_channel=None
-            )
-        members_name = [f"`{member.display_name}`" for member in members]
-        members_log = [f"user<{member.id}>" for member in members]
-        LOG.info(f"Unban {','.join(members_log)} from channel<{channel.guild.id}/{channel.id}>.")
-        return {"embed": _success_embed_generator(
-            author=author,
-            message=f"執行成功，已將{'、'.join(members_name)}自頻道解除驅逐。"
-        )}
+        succeeded, failed = await vo.BATCH.run(args, unban)
+        _log_batch("Unban", channel, succeeded, failed)
+        return {"embed": _batch_embed_generator(author, "自頻道解除驅逐", succeeded, failed)}
 
 class Mute(BaseCommand):
+    name = "mute"
+    category = "管理頻道"
+    description = "禁止所有人說話"
+    usage = "mute"
+    # 指令說明
+    intro = (
+        "將頻道靜音，所有使用者將無法說話。",
+    )
+    # 指令範例
+    examples = (
+        "mute",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道靜音，所有使用者將無法說話。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "mute",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="mute",
-            format_="mute",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
-    @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
         # 則執行指令
         everyone_role = channel.guild.default_role
-        await channel.set_permissions(everyone_role, speak=False)
+        await apply_overwrite(channel, everyone_role, {"speak": False})
         LOG.info(f"Mute channel<{channel.guild.id}/{channel.id}>.")
         return {"embed": _success_embed_generator(
             author=author,
@@ -778,43 +796,103 @@ class Mute(BaseCommand):
         )}
 
 class UnMute(BaseCommand):
+    name = "unmute"
+    category = "管理頻道"
+    description = "允許所有人說話"
+    usage = "unmute"
+    # 指令說明
+    intro = (
+        "將頻道取消靜音，所有使用者將可以說話。",
+    )
+    # 指令範例
+    examples = (
+        "unmute",
+    )
+
     @staticmethod
-    async def help(raw_message: Message) -> dict:
-        # 訊息發送者
-        author = raw_message.author
-        # 指令說明
-        intro = [
-            "將頻道取消靜音，所有使用者將可以說話。",
-        ]
-        # 指令參數說明
-        args = []
-        # 指令範例
-        example = [
-            "unmute",
-        ]
-        embed = _help_embed_generator(
-            author=author,
-            title="unmute",
-            format_="unmute",
-            intro=intro,
-            args=args,
-            example=example,
-        )
-        return {"embed": embed}
-    
-    @staticmethod
-    async def execute(table_name: str, raw_message: Message, args: Optional[tuple]=None) -> dict:
+    async def execute(guild_key: int, raw_message: Message, args: Optional[tuple]=None) -> dict:
         channel = raw_message.channel # 頻道
         author = raw_message.author   # 訊息發送者
-        # 檢查是否為管理員
-        if not _is_admin(table_name, channel, author):
-            return {"embed": _not_admin_embed_generator(author)}
-        
         # 則執行指令
         everyone_role = channel.guild.default_role
-        await channel.set_permissions(everyone_role, speak=None)
+        await apply_overwrite(channel, everyone_role, {"speak": None})
         LOG.info(f"Unmute channel<{channel.guild.id}/{channel.id}>.")
         return {"embed": _success_embed_generator(
             author=author,
             message=f"修改成功，已將頻道取消靜音。"
         )}
+
+# 各指令之說明Embed模板，於載入時依註冊表建立一次
+_HELP_TEMPLATES: dict[type[BaseCommand], Embed] = {
+    command: _help_template(command) for command in dict.fromkeys(COMMANDS.values()) if command != Help
+}
+_HELP_TEMPLATES[Help] = _overview_template(list(_HELP_TEMPLATES))
+
+class CommandContext:
+    """
+    指令執行上下文，訊息指令與斜線指令共用。
+    """
+    __slots__ = ("raw", "name", "args", "slash", "state", "command", "response", "done")
+    def __init__(self, raw: Union[Message, ApplicationContext], name: str, args: Optional[tuple]=None) -> None:
+        self.raw = raw                                  # 原始訊息或斜線指令
+        self.name = name                                # 指令名稱
+        self.args = args                                # 指令參數
+        self.slash = not isinstance(raw, Message)       # 是否為斜線指令
+        self.state: Optional[vo.GuildState] = None      # 群組狀態
+        self.command: Optional[type[BaseCommand]] = None
+        self.response: Optional[dict] = None            # 回覆內容
+        self.done = False                               # 是否結束流程
+
+    def finish(self, response: Optional[dict]=None) -> None:
+        """
+        結束流程，後續僅執行回覆階段。
+
+        response: :class:`dict | None`
+            回覆內容，`None`表示不回覆。
+        """
+        self.response = response
+        self.done = True
+
+async def _gate_stage(context: CommandContext) -> None:
+    # 檢查是否在動態語音類別內且不在起始頻道
+    raw = context.raw
+    state = vo.GUILDS.for_channel(raw.channel)
+    if state == None or raw.channel == state.initial_channel:
+        # 訊息指令直接略過，斜線指令則回覆錯誤
+        return context.finish({"embed": _not_dvc_embed_generator(raw.author)} if context.slash else None)
+    command = get_command(context.name)
+    if command == None: return context.finish()
+    context.state, context.command = state, command
+
+async def _authorize_stage(context: CommandContext) -> None:
+    # 檢查是否為管理員
+    raw = context.raw
+    if not context.command.require_admin: return
+    if not await _is_admin(context.state.guild_key, raw.channel, raw.author):
+        context.finish({"embed": _not_admin_embed_generator(raw.author)})
+
+async def _parse_stage(context: CommandContext) -> None:
+    # 檢查參數格式
+    try: context.args = context.command.parse(context.raw, context.args)
+    except ArgumentError:
+        context.finish({"embed": _format_error_embed_generator(context.raw.author, context.command.name)})
+
+async def _execute_stage(context: CommandContext) -> None:
+    # 同一頻道之指令與事件依序執行
+    raw = context.raw
+    async with vo.CHANNEL_LOCKS.lock(raw.channel.id):
+        context.response = await context.command.execute(context.state.guild_key, raw, context.args)
+
+async def _respond_stage(context: CommandContext) -> None:
+    if not context.response: return
+    # 斜線指令已延後回應，以後續訊息回覆
+    if context.slash: await context.raw.followup.send(**context.response, ephemeral=True)
+    else: await vo.SCHEDULER.request(vo.INTERACTIVE, "send_message", context.raw.channel.id, context.raw.reply, **context.response)
+
+# 指令管線: 類別檢查 -> 權限檢查 -> 參數解析 -> 執行 -> 回覆
+COMMAND_PIPELINE = Pipeline()
+COMMAND_PIPELINE.use("gate", _gate_stage)
+COMMAND_PIPELINE.use("authorize", _authorize_stage)
+COMMAND_PIPELINE.use("parse", _parse_stage)
+COMMAND_PIPELINE.use("execute", _execute_stage)
+COMMAND_PIPELINE.use("respond", _respond_stage, always=True)
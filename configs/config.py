@@ -11,6 +11,25 @@ from typing import Union
 # DEBUG
 # NOTSET
 
+class GuildConfig:
+    GUILD_ID: int
+    CHANNEL_ID: int
+    CATEGORY_ID: int = 0
+    def __init__(self, data: dict) -> None:
+        self.GUILD_ID = int(data["guild_id"])
+        self.CHANNEL_ID = int(data["channel_id"])
+        self.CATEGORY_ID = int(data.get("category_id", 0))
+
+class ShardingConfig:
+    MODE: str = "none"
+    SHARD_COUNT: int = 1
+    SHARD_IDS: tuple[int]
+    def __init__(self, data: dict) -> None:
+        if data["mode"] in ("none", "auto", "range"):
+            self.MODE = data["mode"]
+        self.SHARD_COUNT = max(int(data["shard_count"]), 1)
+        self.SHARD_IDS = tuple(int(shard_id) for shard_id in data["shard_ids"] if 0 <= int(shard_id) < self.SHARD_COUNT)
+
 class LoggingConfig:
     STREAM_LEVEL: int = 20
     FILE_LEVEL: int = 20
@@ -26,12 +45,93 @@ class LoggingConfig:
         self.FILE_NAME = data["file_name"]
         self.DIR_PATH = data["dir_path"]
 
+class DatabaseConfig:
+    BACKEND: str = "sqlite"
+    PATH: str = "data.db"
+    POOL: str = "thread"
+    WORKERS: int = 1
+    MAX_PENDING: int = 256
+    FLUSH_INTERVAL: float = 5
+    FLUSH_THRESHOLD: int = 64
+    JOURNAL_MODE: str = "wal"
+    SYNCHRONOUS: str = "normal"
+    CACHE_SIZE: int = -8000
+    MMAP_SIZE: int = 0
+    BUSY_TIMEOUT: int = 5000
+    BUSY_RETRIES: int = 5
+    def __init__(self, data: dict) -> None:
+        if data["backend"] in ("sqlite", "memory"):
+            self.BACKEND = data["backend"]
+        self.PATH = data["path"]
+        if data["pool"] in ("none", "thread", "shared"):
+            self.POOL = data["pool"]
+        self.WORKERS = max(data["workers"], 1)
+        self.MAX_PENDING = max(data["max_pending"], 1)
+        self.FLUSH_INTERVAL = max(data["flush_interval"], 0.1)
+        self.FLUSH_THRESHOLD = max(data["flush_threshold"], 1)
+        if str(data["journal_mode"]).lower() in ("delete", "truncate", "persist", "memory", "wal", "off"):
+            self.JOURNAL_MODE = str(data["journal_mode"]).lower()
+        if str(data["synchronous"]).lower() in ("off", "normal", "full", "extra"):
+            self.SYNCHRONOUS = str(data["synchronous"]).lower()
+        self.CACHE_SIZE = int(data["cache_size"])
+        self.MMAP_SIZE = max(int(data["mmap_size"]), 0)
+        self.BUSY_TIMEOUT = max(int(data["busy_timeout"]), 0)
+        self.BUSY_RETRIES = max(int(data["busy_retries"]), 0)
+
+    @property
+    def PRAGMAS(self) -> dict[str, Union[str, int]]:
+        # busy_timeout需優先設定，切換journal_mode時才會等待鎖
+        return {
+            "busy_timeout": self.BUSY_TIMEOUT,
+            "journal_mode": self.JOURNAL_MODE,
+            "synchronous": self.SYNCHRONOUS,
+            "cache_size": self.CACHE_SIZE,
+            "mmap_size": self.MMAP_SIZE,
+        }
+
+class BackupConfig:
+    ENABLE: bool = True
+    INTERVAL: float = 3600
+    RETENTION: int = 24
+    PAGES: int = 64
+    DIR_PATH: str = "backups"
+    def __init__(self, data: dict) -> None:
+        self.ENABLE = bool(data["enable"])
+        self.INTERVAL = max(data["interval"], 60)
+        self.RETENTION = max(int(data["retention"]), 0)
+        self.PAGES = max(int(data["pages"]), 1)
+        self.DIR_PATH = data["dir_path"]
+
+class JoinConfig:
+    CONCURRENCY: int = 8
+    POOL_SIZE: int = 0
+    DELETE_GRACE: float = 15
+    BATCH_CONCURRENCY: int = 4
+    REST_CONCURRENCY: int = 4
+    ROUTE_LIMITS: dict[str, tuple[int, float]]
+    def __init__(self, data: dict) -> None:
+        self.CONCURRENCY = max(int(data["concurrency"]), 1)
+        self.POOL_SIZE = max(int(data["pool_size"]), 0)
+        self.DELETE_GRACE = max(float(data["delete_grace"]), 0)
+        self.BATCH_CONCURRENCY = max(int(data["batch_concurrency"]), 1)
+        self.REST_CONCURRENCY = max(int(data["rest_concurrency"]), 1)
+        self.ROUTE_LIMITS = {
+            route: (max(int(rate), 1), max(float(per), 0.001))
+            for route, (rate, per) in data["route_limits"].items()
+        }
+
 CONFIG = {
     "discord": {
         "token": "",
         "channel_id": 0,
         "guild_id": 0,
-        "prefixs": ["$"]
+        "prefixs": ["$"],
+        "guilds": [],
+    },
+    "sharding": {
+        "mode": "none",
+        "shard_count": 1,
+        "shard_ids": [],
     },
     "logging": {
         "main": {
@@ -49,6 +149,42 @@ CONFIG = {
             "dir_path": "logs",
         },
     },
+    "database": {
+        "backend": "sqlite",
+        "path": "data.db",
+        "pool": "thread",
+        "workers": 1,
+        "max_pending": 256,
+        "flush_interval": 5,
+        "flush_threshold": 64,
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "busy_timeout": 5000,
+        "busy_retries": 5,
+    },
+    "backup": {
+        "enable": True,
+        "interval": 3600,
+        "retention": 24,
+        "pages": 64,
+        "dir_path": "backups",
+    },
+    "join": {
+        "concurrency": 8,
+        "pool_size": 0,
+        "delete_grace": 15,
+        "batch_concurrency": 4,
+        "rest_concurrency": 4,
+        "route_limits": {
+            "create_channel": [5, 5.0],
+            "move_member": [10, 1.0],
+            "edit_channel": [5, 5.0],
+            "delete_channel": [5, 5.0],
+            "send_message": [5, 5.0],
+        },
+    },
     "timezone": 8,
 }
 
@@ -71,11 +207,21 @@ DISCORD_TOKEN: str = CONFIG["discord"]["token"]
 DISCORD_CHANNEL: int = CONFIG["discord"]["channel_id"]
 DISCORD_GUILD: int = CONFIG["discord"]["guild_id"]
 DISCORD_PREFIXS: tuple[str] = tuple(CONFIG["discord"]["prefixs"])
+# 多群組設定，未設定時使用`guild_id`與`channel_id`
+DISCORD_GUILDS: tuple[GuildConfig] = tuple(map(GuildConfig, CONFIG["discord"]["guilds"])) or (
+    GuildConfig({"guild_id": DISCORD_GUILD, "channel_id": DISCORD_CHANNEL}),
+)
+
+SHARDING_CONFIG = ShardingConfig(CONFIG["sharding"])
 
 LOGGING_CONFIG: dict[str, LoggingConfig] = {
     "main": LoggingConfig(CONFIG["logging"]["main"]),
     "discord": LoggingConfig(CONFIG["logging"]["discord"]),
 }
 
+DATABASE_CONFIG = DatabaseConfig(CONFIG["database"])
+BACKUP_CONFIG = BackupConfig(CONFIG["backup"])
+JOIN_CONFIG = JoinConfig(CONFIG["join"])
+
 TIMEZONE: timezone = timezone(timedelta(hours=CONFIG["timezone"]))
         
\ No newline at end of file
@@ -1,3 +1,9 @@
+from .connection import *
+from .schema import *
+from .statements import STATEMENTS, statement_stats, reset_stats
 from .base import *
 from .admins import *
-from .bans import *
\ No newline at end of file
+from .bans import *
+from .backend import *
+from .state import *
+from .backup import BACKUP, BackupScheduler, backup_database, restore_database
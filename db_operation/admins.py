@@ -1,91 +1,89 @@
-from sqlite3 import connect
-from modules import Json
+from .connection import POOL
+from .statements import DELETE_ADMIN, INSERT_ADMIN, REFRESH_NO_ADMIN, SELECT_ADMINS, SELECT_CLAIM_STATE, SELECT_NO_ADMIN, UPDATE_LAST_ADMIN, UPDATE_NO_ADMIN
 
-def get_admin(table_name: str, channel_id: int) -> list[int]:
+from typing import Optional
+
+def get_admin(guild_id: int, channel_id: int) -> list[int]:
     """
     取得該頻道管理員之列表。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     
     return: :class:`list[int]`
         管理員清單。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    # 取得表格
-    cursor.execute(f"SELECT admin_list FROM \"{table_name}\" WHERE channel_id=$1", (channel_id,))
-    admin_list: list[int] = Json.loads(cursor.fetchone()[0])
-
-    # 關閉資料庫
-    cursor.close()
-    db.close()
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 取得管理員
+        admin_list: list[int] = [user_id for user_id, in SELECT_ADMINS.fetchall(db, (channel_id,))]
 
     return admin_list
 
-def add_admin(table_name: str, channel_id: int, user_id: int) -> None:
+def add_admin(guild_id: int, channel_id: int, user_id: int) -> None:
     """
     將使用者新增至該頻道之管理員。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     user_id: :class:`int`
         使用者ID。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    # 取得表格
-    cursor.execute(f"SELECT admin_list FROM \"{table_name}\" WHERE channel_id=$1", (channel_id,))
-    admin_list: list = Json.loads(cursor.fetchone()[0])
-    # 將使用者加入清單
-    if user_id not in admin_list: admin_list.append(user_id)
-    cursor.execute(f"UPDATE \"{table_name}\" SET admin_list=$1, no_admin=0 WHERE channel_id=$2", (Json.dumps(admin_list), channel_id,))
-    db.commit()
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 將使用者加入清單
+        INSERT_ADMIN.execute(db, (channel_id, user_id,))
+        UPDATE_NO_ADMIN.execute(db, (0, guild_id, channel_id,))
 
-    # 關閉資料庫
-    cursor.close()
-    db.close()
-
-def remove_admin(table_name: str, channel_id: int, user_id: int) -> None:
+def remove_admin(guild_id: int, channel_id: int, user_id: int) -> None:
     """
     移除該使用者於頻道之管理員。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     user_id: :class:`int`
         使用者ID。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 將使用者自清單移除
+        if DELETE_ADMIN.execute(db, (channel_id, user_id,)).rowcount != 0:
+            UPDATE_LAST_ADMIN.execute(db, (user_id, guild_id, channel_id,))
+        # 檢查頻道內是否還有管理員
+        REFRESH_NO_ADMIN.execute(db, (channel_id, guild_id,))
+
+def member_leave(guild_id: int, channel_id: int, user_id: int) -> tuple[bool, bool, Optional[int]]:
+    """
+    使用者離開頻道，於單一交易內移除其管理員身分並回傳前後狀態。
 
-    # 取得表格
-    cursor.execute(f"SELECT admin_list FROM \"{table_name}\" WHERE channel_id=$1", (channel_id,))
-    admin_list: list = Json.loads(cursor.fetchone()[0])
-    # 將使用者自清單移除
-    if user_id in admin_list:
-        admin_list.remove(user_id)
-        cursor.execute(f"UPDATE \"{table_name}\" SET last_admin=$1 WHERE channel_id=$2", (user_id, channel_id,))
-    # 檢查頻道內是否還有管理員
-    no_admin = len(admin_list) == 0
-    cursor.execute(f"UPDATE \"{table_name}\" SET admin_list=$1, no_admin=$2 WHERE channel_id=$3",(
-        Json.dumps(admin_list), # 管理員清單
-        int(no_admin),          # 是否有管理員
-        channel_id,
-                     # 頻道ID
-    ))
-    db.commit()
+    guild_id: :class:`int`
+        群組ID。
+    channel_id: :class:`int`
+        頻道ID。
+    user_id: :class:`int`
+        使用者ID。
+
+    return: :class:`tuple[bool, bool, int | None]`
+        (離開前是否能夠請求成為管理員, 離開後是否能夠請求成為管理員, 上一位離開的管理員ID)。
+    """
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 鎖定資料庫，避免其他操作穿插
+        if not db.in_transaction: db.execute("BEGIN IMMEDIATE")
+        result = SELECT_NO_ADMIN.fetchone(db, (guild_id, channel_id,))
+        if result == None: return False, False, None
+        was_claimable = bool(result[0])
+        # 將使用者自清單移除
+        if DELETE_ADMIN.execute(db, (channel_id, user_id,)).rowcount != 0:
+            UPDATE_LAST_ADMIN.execute(db, (user_id, guild_id, channel_id,))
+        # 檢查頻道內是否還有管理員
+        REFRESH_NO_ADMIN.execute(db, (channel_id, guild_id,))
+        is_claimable, last_admin = SELECT_CLAIM_STATE.fetchone(db, (guild_id, channel_id,))
 
-    # 關閉資料庫
-    cursor.close()
-    db.close()
\ No newline at end of file
+    return was_claimable, bool(is_claimable), last_admin
\ No newline at end of file
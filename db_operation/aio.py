@@ -0,0 +1,135 @@
+from .backend import StorageBackend, get_backend
+from modules import Thread
+
+from asyncio import AbstractEventLoop, Future, Semaphore, get_running_loop
+from functools import wraps
+from queue import SimpleQueue
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+def _set_result(future: Future, result: Any) -> None:
+    if not future.done(): future.set_result(result)
+
+def _set_exception(future: Future, exception: BaseException) -> None:
+    if not future.done(): future.set_exception(exception)
+
+class DBExecutor:
+    """
+    資料庫工作線程。
+    將阻塞之資料庫操作交由背景線程執行，避免卡住事件迴圈。
+    待處理之工作數量上限為`max_pending`，超過時呼叫者將等待。
+    """
+    def __init__(self, workers: int=1, max_pending: int=256) -> None:
+        self._workers = max(workers, 1)
+        self._max_pending = max(max_pending, 1)
+        self._queue: SimpleQueue = SimpleQueue()
+        self._threads: list[Thread] = []
+        self._semaphore: Optional[Semaphore] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        目前尚未完成之工作數量(包含等待排入者)。
+        """
+        return self._pending
+
+    def configure(self, workers: int=None, max_pending: int=None) -> None:
+        """
+        重新設定工作線程，已啟動之線程將會被關閉。
+
+        workers: :class:`int`
+            工作線程數量。
+        max_pending: :class:`int`
+            待處理工作數量上限。
+        """
+        self.shutdown()
+        if workers != None: self._workers = max(workers, 1)
+        if max_pending != None: self._max_pending = max(max_pending, 1)
+        self._semaphore = None
+
+    def start(self) -> None:
+        """
+        啟動工作線程。
+        """
+        if len(self._threads) != 0: return
+        for i in range(self._workers):
+            thread = Thread(target=self._worker, name=f"DBWorker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self, wait: bool=True) -> None:
+        """
+        關閉工作線程，已排入之工作仍會執行完畢。
+
+        wait: :class:`bool`
+            是否等待線程結束。
+        """
+        threads, self._threads = self._threads, []
+        for _ in threads: self._queue.put(None)
+        if wait:
+            for thread in threads: thread.join()
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        於工作線程執行`func`並等待其結果。
+
+        func: :class:`Callable`
+            要執行之函數。
+
+        return: :class:`Any`
+            函數回傳值。
+        """
+        if self._semaphore == None:
+            self._semaphore = Semaphore(self._max_pending)
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                self.start()
+                loop = get_running_loop()
+                future = loop.create_future()
+                self._queue.put((loop, future, func, args, kwargs))
+                return await future
+        finally:
+            self._pending -= 1
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item == None: return
+            loop: AbstractEventLoop
+            loop, future, func, args, kwargs = item
+            if future.cancelled(): continue
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as exc:
+                loop.call_soon_threadsafe(_set_exception, future, exc)
+            else:
+                loop.call_soon_threadsafe(_set_result, future, result)
+
+EXECUTOR = DBExecutor()
+
+def _wrap(name: str) -> Callable[..., Awaitable]:
+    @wraps(getattr(StorageBackend, name))
+    async def wrapper(*args, **kwargs):
+        # 於執行時取得後端，以便切換
+        return await EXECUTOR.run(getattr(get_backend(), name), *args, **kwargs)
+    return wrapper
+
+database_init = _wrap("database_init")
+get_channels = _wrap("get_channels")
+new_channel = _wrap("new_channel")
+delete_channel = _wrap("delete_channel")
+can_claim = _wrap("can_claim")
+set_claim = _wrap("set_claim")
+last_admin = _wrap("last_admin")
+
+get_admin = _wrap("get_admin")
+add_admin = _wrap("add_admin")
+remove_admin = _wrap("remove_admin")
+member_leave = _wrap("member_leave")
+
+get_ban = _wrap("get_ban")
+add_ban = _wrap("add_ban")
+remove_ban = _wrap("remove_ban")
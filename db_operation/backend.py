@@ -0,0 +1,198 @@
+from . import base, admins, bans, schema
+from .connection import POOL
+
+from contextlib import AbstractContextManager, contextmanager
+from threading import RLock
+from typing import Iterator, Optional, Protocol
+
+class ChannelState:
+    """
+    單一頻道之資料。
+    """
+    __slots__ = ("admin_list", "ban_list", "no_admin", "last_admin")
+    def __init__(
+        self,
+        admin_list: Optional[list[int]]=None,
+        ban_list: Optional[list[int]]=None,
+        no_admin: bool=True,
+        last_admin: Optional[int]=None,
+    ) -> None:
+        self.admin_list: set[int] = set(admin_list or ())
+        self.ban_list: set[int] = set(ban_list or ())
+        self.no_admin = no_admin
+        self.last_admin = last_admin
+
+class StorageBackend(Protocol):
+    """
+    資料儲存後端介面。
+    """
+    def migrate(self) -> int: ...
+    def transaction(self) -> AbstractContextManager: ...
+    def close(self) -> None: ...
+    def database_init(self, guild_id: int) -> int: ...
+    def get_channels(self, guild_id: int) -> list[tuple[int, list[int], list[int], bool, Optional[int]]]: ...
+    def new_channel(self, guild_id: int, channel_id: int) -> None: ...
+    def delete_channel(self, guild_id: int, channel_id: int) -> None: ...
+    def can_claim(self, guild_id: int, channel_id: int) -> bool: ...
+    def set_claim(self, guild_id: int, channel_id: int, can_claim: bool) -> None: ...
+    def last_admin(self, guild_id: int, channel_id: int) -> Optional[int]: ...
+    def get_admin(self, guild_id: int, channel_id: int) -> list[int]: ...
+    def add_admin(self, guild_id: int, channel_id: int, user_id: int) -> None: ...
+    def remove_admin(self, guild_id: int, channel_id: int, user_id: int) -> None: ...
+    def member_leave(self, guild_id: int, channel_id: int, user_id: int) -> tuple[bool, bool, Optional[int]]: ...
+    def get_ban(self, guild_id: int, channel_id: int) -> list[int]: ...
+    def add_ban(self, guild_id: int, channel_id: int, user_id: int) -> None: ...
+    def remove_ban(self, guild_id: int, channel_id: int, user_id: int) -> None: ...
+
+class SQLiteBackend:
+    """
+    SQLite儲存後端，經由連線池存取資料庫。
+    """
+    migrate = staticmethod(schema.migrate)
+    database_init = staticmethod(base.database_init)
+    get_channels = staticmethod(base.get_channels)
+    new_channel = staticmethod(base.new_channel)
+    delete_channel = staticmethod(base.delete_channel)
+    can_claim = staticmethod(base.can_claim)
+    set_claim = staticmethod(base.set_claim)
+    last_admin = staticmethod(base.last_admin)
+    get_admin = staticmethod(admins.get_admin)
+    add_admin = staticmethod(admins.add_admin)
+    remove_admin = staticmethod(admins.remove_admin)
+    member_leave = staticmethod(admins.member_leave)
+    get_ban = staticmethod(bans.get_ban)
+    add_ban = staticmethod(bans.add_ban)
+    remove_ban = staticmethod(bans.remove_ban)
+
+    def transaction(self) -> AbstractContextManager:
+        return POOL.transaction()
+
+    def close(self) -> None:
+        POOL.close()
+
+class MemoryBackend:
+    """
+    純記憶體儲存後端，不會寫入磁碟，程式結束後資料即消失。
+    """
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._guilds: dict[int, dict[int, ChannelState]] = {}
+
+    def _get(self, guild_id: int, channel_id: int) -> Optional[ChannelState]:
+        return self._guilds.get(guild_id, {}).get(channel_id)
+
+    def migrate(self) -> int:
+        return schema.SCHEMA_VERSION
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def close(self) -> None:
+        with self._lock:
+            self._guilds.clear()
+
+    def database_init(self, guild_id: int) -> int:
+        with self._lock:
+            self._guilds.setdefault(guild_id, {})
+        return guild_id
+
+    def get_channels(self, guild_id: int) -> list[tuple[int, list[int], list[int], bool, Optional[int]]]:
+        with self._lock:
+            return [
+                (channel_id, list(state.admin_list), list(state.ban_list), state.no_admin, state.last_admin)
+                for channel_id, state in self._guilds.get(guild_id, {}).items()
+            ]
+
+    def new_channel(self, guild_id: int, channel_id: int) -> None:
+        with self._lock:
+            self._guilds.setdefault(guild_id, {}).setdefault(channel_id, ChannelState())
+
+    def delete_channel(self, guild_id: int, channel_id: int) -> None:
+        with self._lock:
+            self._guilds.get(guild_id, {}).pop(channel_id, None)
+
+    def can_claim(self, guild_id: int, channel_id: int) -> bool:
+        state = self._get(guild_id, channel_id)
+        return state != None and state.no_admin
+
+    def set_claim(self, guild_id: int, channel_id: int, can_claim: bool) -> None:
+        with self._lock:
+            state = self._get(guild_id, channel_id)
+            if state != None: state.no_admin = can_claim
+
+    def last_admin(self, guild_id: int, channel_id: int) -> Optional[int]:
+        state = self._get(guild_id, channel_id)
+        return None if state == None else state.last_admin
+
+    def get_admin(self, guild_id: int, channel_id: int) -> list[int]:
+        state = self._get(guild_id, channel_id)
+        return [] if state == None else list(state.admin_list)
+
+    def add_admin(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        with self._lock:
+            state = self._get(guild_id, channel_id)
+            if state == None: return
+            state.admin_list.add(user_id)
+            state.no_admin = False
+
+    def remove_admin(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        self.member_leave(guild_id, channel_id, user_id)
+
+    def member_leave(self, guild_id: int, channel_id: int, user_id: int) -> tuple[bool, bool, Optional[int]]:
+        with self._lock:
+            state = self._get(guild_id, channel_id)
+            if state == None: return False, False, None
+            was_claimable = state.no_admin
+            if user_id in state.admin_list:
+                state.admin_list.remove(user_id)
+                state.last_admin = user_id
+            state.no_admin = len(state.admin_list) == 0
+            return was_claimable, state.no_admin, state.last_admin
+
+    def get_ban(self, guild_id: int, channel_id: int) -> list[int]:
+        state = self._get(guild_id, channel_id)
+        return [] if state == None else list(state.ban_list)
+
+    def add_ban(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        with self._lock:
+            state = self._get(guild_id, channel_id)
+            if state != None: state.ban_list.add(user_id)
+
+    def remove_ban(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        with self._lock:
+            state = self._get(guild_id, channel_id)
+            if state != None: state.ban_list.discard(user_id)
+
+BACKENDS: dict[str, type] = {
+    "sqlite": SQLiteBackend,
+    "memory": MemoryBackend,
+}
+
+_backend: StorageBackend = SQLiteBackend()
+
+def use_backend(name: str) -> StorageBackend:
+    """
+    切換資料儲存後端。
+
+    name: :class:`str`
+        後端名稱，`sqlite`或`memory`。
+
+    return: :class:`StorageBackend`
+        新的儲存後端。
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend `{name}`.")
+    _backend.close()
+    _backend = BACKENDS[name]()
+    return _backend
+
+def get_backend() -> StorageBackend:
+    """
+    取得目前之資料儲存後端。
+
+    return: :class:`StorageBackend`
+    """
+    return _backend
@@ -0,0 +1,163 @@
+from .connection import POOL
+
+from asyncio import CancelledError, Task, create_task, sleep as a_sleep, to_thread
+from datetime import datetime
+from logging import getLogger
+from os import listdir, makedirs, remove
+from os.path import basename, isdir, join, splitext
+from sqlite3 import connect
+from typing import Optional
+
+logger = getLogger("main")
+
+def backup_database(dest: str, path: Optional[str]=None, pages: int=64, sleep: float=0.01) -> None:
+    """
+    使用SQLite線上備份API將資料庫複製至`dest`。
+    每次僅複製`pages`頁，並於每步之間暫停`sleep`秒，以免長時間阻擋寫入。
+
+    dest: :class:`str`
+        備份檔案路徑。
+    path: :class:`str`
+        來源資料庫路徑，預設為連線池之資料庫。
+    pages: :class:`int`
+        每步複製之頁數。
+    sleep: :class:`float`
+        每步之間暫停之秒數。
+    """
+    source = connect(path or POOL.path)
+    target = connect(dest)
+    try:
+        with target:
+            source.backup(target, pages=max(pages, 1), sleep=sleep)
+    finally:
+        target.close()
+        source.close()
+
+def restore_database(src: str, path: Optional[str]=None, pages: int=-1) -> None:
+    """
+    將備份檔案`src`還原至資料庫。
+
+    src: :class:`str`
+        備份檔案路徑。
+    path: :class:`str`
+        目標資料庫路徑，預設為連線池之資料庫。
+    pages: :class:`int`
+        每步複製之頁數，`-1`表示一次完成。
+    """
+    source = connect(src)
+    target = connect(path or POOL.path)
+    try:
+        with target:
+            source.backup(target, pages=pages)
+    finally:
+        target.close()
+        source.close()
+
+class BackupScheduler:
+    """
+    定期備份資料庫之背景工作。
+    備份於獨立線程進行，不會佔用事件迴圈與資料庫工作線程。
+    """
+    def __init__(
+        self,
+        dir_path: str="backups",
+        interval: float=3600,
+        retention: int=24,
+        pages: int=64,
+        sleep: float=0.01,
+    ) -> None:
+        self.dir_path = dir_path
+        self.interval = max(interval, 1)
+        self.retention = retention
+        self.pages = pages
+        self.sleep = sleep
+        self._task: Optional[Task] = None
+
+    def configure(
+        self,
+        dir_path: Optional[str]=None,
+        interval: Optional[float]=None,
+        retention: Optional[int]=None,
+        pages: Optional[int]=None,
+    ) -> None:
+        """
+        重新設定備份參數。
+
+        dir_path: :class:`str`
+            備份資料夾路徑。
+        interval: :class:`float`
+            備份間隔(秒)。
+        retention: :class:`int`
+            保留之備份數量，`0`表示全部保留。
+        pages: :class:`int`
+            每步複製之頁數。
+        """
+        if dir_path != None: self.dir_path = dir_path
+        if interval != None: self.interval = max(interval, 1)
+        if retention != None: self.retention = retention
+        if pages != None: self.pages = pages
+
+    def _gen_filename(self) -> str:
+        title, ext = splitext(basename(POOL.path))
+        str_time = datetime.now().replace(microsecond=0).isoformat().replace(":", "_")
+        return join(self.dir_path, f"{title} {str_time}{ext or '.db'}")
+
+    def list_backups(self) -> list[str]:
+        """
+        取得所有備份檔案，由新到舊排序。
+
+        return: :class:`list[str]`
+        """
+        if not isdir(self.dir_path): return []
+        title, _ = splitext(basename(POOL.path))
+        backups = [join(self.dir_path, name) for name in listdir(self.dir_path) if name.startswith(f"{title} ")]
+        backups.sort(reverse=True)
+        return backups
+
+    def _delete_file(self) -> None:
+        if self.retention <= 0: return
+        for file in self.list_backups()[self.retention:]:
+            remove(file)
+
+    async def backup(self) -> str:
+        """
+        立即進行一次備份。
+
+        return: :class:`str`
+            備份檔案路徑。
+        """
+        if not isdir(self.dir_path): makedirs(self.dir_path)
+        dest = self._gen_filename()
+        await to_thread(backup_database, dest, None, self.pages, self.sleep)
+        await to_thread(self._delete_file)
+        return dest
+
+    async def _backup_loop(self) -> None:
+        while True:
+            await a_sleep(self.interval)
+            try:
+                dest = await self.backup()
+                logger.info(f"Backup database to `{dest}`.")
+            except CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Backup database failed: {exc!r}")
+
+    def start(self) -> None:
+        """
+        啟動定期備份，需於事件迴圈內呼叫。
+        """
+        if self._task != None and not self._task.done(): return
+        self._task = create_task(self._backup_loop())
+
+    async def stop(self) -> None:
+        """
+        停止定期備份。
+        """
+        if self._task == None: return
+        self._task.cancel()
+        try: await self._task
+        except CancelledError: pass
+        self._task = None
+
+BACKUP = BackupScheduler()
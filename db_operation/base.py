@@ -1,159 +1,131 @@
-from sqlite3 import connect
+from .connection import POOL
+from .statements import DELETE_CHANNEL, DELETE_CHANNEL_ADMINS, DELETE_CHANNEL_BANS, INSERT_CHANNEL, SELECT_CHANNELS, SELECT_GUILD_ADMINS, SELECT_GUILD_BANS, SELECT_LAST_ADMIN, SELECT_NO_ADMIN, UPDATE_NO_ADMIN
+from .schema import create_tables
 
-def database_init(guild_id: int) -> str:
+from typing import Optional
+
+def database_init(guild_id: int) -> int:
+    """
+    檢查資料庫表格是否存在，若不存在則創建新表格。
+
+    guild_id: :class:`int`
+        群組ID。
+
+    return: :class:`int`
+        該群組於資料庫中之鍵值。
     """
-    檢查該群組之表格是否存在，若不存在則創建一個新表格。
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 如果表格不存在則創建
+        create_tables(db)
+
+    return guild_id
+
+def get_channels(guild_id: int) -> list[tuple[int, list[int], list[int], bool, Optional[int]]]:
+    """
+    取得該群組所有頻道之資料。
 
     guild_id: :class:`int`
         群組ID。
 
-    return: :class:`str`
-        該群組表格之名稱。
+    return: :class:`list[tuple[int, list[int], list[int], bool, int | None]]`
+        (頻道ID, 管理員清單, 被封禁者清單, 是否能夠請求成為管理員, 上一位離開的管理員ID)之清單。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    name = f"guild-{guild_id}"
-    cursor.execute("SELECT name FROM sqlite_master WHERE type=\"table\" AND name=$1", (name,))
-    result = cursor.fetchone()
-    if result == None:
-        # 如果該表格不存在
-        cursor.execute(f"""
-            CREATE TABLE \"{name}\" (
-                "channel_id"	INTEGER NOT NULL UNIQUE,
-                "admin_list"	TEXT NOT NULL DEFAULT "[]",
-                "ban_list"	TEXT NOT NULL DEFAULT "[]",
-                "no_admin"	BLOB NOT NULL DEFAULT 1,
-                "last_admin"	INTEGER,
-                PRIMARY KEY("channel_id")
-            )
-        """)
-        db.commit()
-
-    # 關閉資料庫
-    cursor.close()
-    db.close()
-
-    return name
-
-def new_channel(table_name: str, channel_id: int) -> None:
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 取得資料
+        channels = {
+            channel_id: ([], [], bool(no_admin), last_admin)
+            for channel_id, no_admin, last_admin in SELECT_CHANNELS.fetchall(db, (guild_id,))
+        }
+        # 取得管理員與被封禁者
+        for index, query in ((0, SELECT_GUILD_ADMINS), (1, SELECT_GUILD_BANS)):
+            for channel_id, user_id in query.fetchall(db, (guild_id,)):
+                channels[channel_id][index].append(user_id)
+
+    return [(channel_id, *data) for channel_id, data in channels.items()]
+
+def new_channel(guild_id: int, channel_id: int) -> None:
     """
     新增頻道資料。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    # 檢查資料是否已經存在
-    cursor.execute(f"SELECT channel_id FROM \"{table_name}\" WHERE channel_id=$1", (channel_id,))
-    if cursor.fetchone() != None: return
-    # 新增資料
-    cursor.execute(f"INSERT INTO \"{table_name}\" (channel_id) VALUES ($1)", (channel_id,))
-    db.commit()
-
-    # 關閉資料庫
-    cursor.close()
-    db.close()
-
-def delete_channel(table_name: str, channel_id: int) -> None:
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 若資料不存在則新增資料
+        INSERT_CHANNEL.execute(db, (guild_id, channel_id,))
+
+def delete_channel(guild_id: int, channel_id: int) -> None:
     """
     刪除頻道資料。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    # 移除資料
-    cursor.execute(f"DELETE FROM \"{table_name}\" WHERE channel_id=$1", (channel_id,))
-    db.commit()
-
-    # 關閉資料庫
-    cursor.close()
-    db.close()
-
-def can_claim(table_name: str, channel_id: int) -> bool:
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 移除資料
+        DELETE_CHANNEL.execute(db, (guild_id, channel_id,))
+        DELETE_CHANNEL_ADMINS.execute(db, (channel_id,))
+        DELETE_CHANNEL_BANS.execute(db, (channel_id,))
+
+def can_claim(guild_id: int, channel_id: int) -> bool:
     """
     檢查該頻道是否能夠請求成為管理員。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     
     return: :class:`bool`
         是否能夠請求成為管理員。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    # 檢查頻道內是否還有管理員
-    cursor.execute(f"SELECT no_admin FROM \"{table_name}\" WHERE channel_id=$1", (channel_id,))
-    result = bool(cursor.fetchone()[0])
-
-    # 關閉資料庫
-    cursor.close()
-    db.close()
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 檢查頻道內是否還有管理員
+        result = bool(SELECT_NO_ADMIN.fetchone(db, (guild_id, channel_id,))[0])
 
     return result
 
-def set_claim(table_name: str, channel_id: int, can_claim: bool) -> None:
+def set_claim(guild_id: int, channel_id: int, can_claim: bool) -> None:
     """
     設置該頻道是否能夠請求成為管理員。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     can_claim: :class:`bool`
         設置為是/否能夠請求成為管理員。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    # 檢查頻道內是否還有管理員
-    cursor.execute(f"UPDATE \"{table_name}\" SET no_admin=$1 WHERE channel_id=$2", (int(can_claim), channel_id,))
-    db.commit()
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 檢查頻道內是否還有管理員
+        UPDATE_NO_ADMIN.execute(db, (int(can_claim), guild_id, channel_id,))
 
-    # 關閉資料庫
-    cursor.close()
-    db.close()
-
-def last_admin(table_name: str, channel_id: int) -> int:
+def last_admin(guild_id: int, channel_id: int) -> int:
     """
     該頻道上一位離開的管理員。
 
-    table_name: :class:`str`
-        該群組表格之名稱。
+    guild_id: :class:`int`
+        群組ID。
     channel_id: :class:`int`
         頻道ID。
     
     return: :class:`int`
         該頻道上一位離開的管理員ID。
     """
-    # 連接至資料庫
-    db = connect("data.db")
-    cursor = db.cursor()
-
-    # 取得資料
-    cursor.execute(f"SELECT last_admin FROM \"{table_name}\" WHERE channel_id=$1", (channel_id,))
-    result = cursor.fetchone()
-    if result != None: result = result[0]
-
-    # 關閉資料庫
-    cursor.close()
-    db.close()
+    # 自連線池取得連線
+    with POOL.connection() as db:
+        # 取得資料
+        result = SELECT_LAST_ADMIN.fetchone(db, (guild_id, channel_id,))
+        if result != None: result = result[0]
 
     return result
@@ -0,0 +1,193 @@
+from contextlib import contextmanager
+from logging import getLogger
+from random import random
+from sqlite3 import Connection, OperationalError, connect
+from threading import Lock, RLock, local
+from time import sleep
+from typing import Callable, Iterator, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+logger = getLogger("main")
+
+POOL_MODES = ("none", "thread", "shared")
+
+class ConnectionPool:
+    """
+    SQLite連線池。
+
+    mode:
+     - none: 每次操作皆重新連線(舊行為)。
+     - thread: 每個線程各自保持一個連線。
+     - shared: 所有線程共用一個連線，並以鎖保護。
+    """
+    def __init__(self, path: str="data.db", mode: str="thread", pragmas: Optional[dict[str, Union[str, int]]]=None, retries: int=5) -> None:
+        self._path = path
+        self._mode = mode
+        self._pragmas = dict(pragmas or {})
+        self._retries = max(retries, 0)
+        self._local = local()
+        self._lock = Lock()
+        self._shared_lock = RLock()
+        self._shared: Connection = None
+        self._connections: list[Connection] = []
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def pragmas(self) -> dict[str, Union[str, int]]:
+        return dict(self._pragmas)
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    def configure(self, path: str=None, mode: str=None, pragmas: Optional[dict[str, Union[str, int]]]=None, retries: int=None) -> None:
+        """
+        重新設定連線池，已開啟之連線將會被關閉。
+
+        path: :class:`str`
+            資料庫路徑。
+        mode: :class:`str`
+            連線模式，`none`、`thread`或`shared`。
+        pragmas: :class:`dict[str, str | int]`
+            開啟連線時套用之PRAGMA設定，如`journal_mode`、`synchronous`。
+        retries: :class:`int`
+            資料庫被其他程序鎖定時之重試次數。
+        """
+        if mode != None and mode not in POOL_MODES:
+            raise ValueError(f"Unknown pool mode `{mode}`.")
+        self.close()
+        if path != None: self._path = path
+        if mode != None: self._mode = mode
+        if pragmas != None: self._pragmas = dict(pragmas)
+        if retries != None: self._retries = max(retries, 0)
+
+    def _open(self) -> Connection:
+        # 連線可能由其他線程關閉
+        db = connect(self._path, check_same_thread=False)
+        for key, value in self._pragmas.items():
+            db.execute(f"PRAGMA {key}={value}")
+        return db
+
+    def _acquire(self) -> Connection:
+        if self._mode == "none":
+            return self._open()
+        if self._mode == "shared":
+            self._shared_lock.acquire()
+            try:
+                if self._shared == None:
+                    self._shared = self._open()
+            except BaseException:
+                # 開啟失敗時釋放鎖，避免後續呼叫永久等待
+                self._shared_lock.release()
+                raise
+            return self._shared
+        db: Connection = getattr(self._local, "db", None)
+        if db == None:
+            db = self._local.db = self._open()
+            with self._lock:
+                self._connections.append(db)
+        return db
+
+    def _release(self, db: Connection) -> None:
+        if self._mode == "none":
+            db.close()
+        elif self._mode == "shared":
+            self._shared_lock.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """
+        取得連線，離開時若無錯誤則提交，否則回滾。
+        於同一線程內巢狀使用時將共用最外層之連線與交易。
+
+        return: :class:`Iterator[Connection]`
+        """
+        active: Connection = getattr(self._local, "active", None)
+        if active != None:
+            # 巢狀使用，由最外層負責提交
+            yield active
+            return
+
+        db = self._acquire()
+        self._local.active = db
+        try:
+            yield db
+            if db.in_transaction: db.commit()
+        except BaseException:
+            if db.in_transaction: db.rollback()
+            raise
+        finally:
+            self._local.active = None
+            self._release(db)
+
+    @contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        """
+        取得連線並立即取得寫入鎖(`BEGIN IMMEDIATE`)，
+        避免多個程序同時寫入時於交易中途才發生鎖定衝突。
+
+        return: :class:`Iterator[Connection]`
+        """
+        with self.connection() as db:
+            if not db.in_transaction: db.execute("BEGIN IMMEDIATE")
+            yield db
+
+    def retry(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        執行`func`，若資料庫被其他程序鎖定則於退避後重試。
+        `func`須為完整之交易，巢狀於其他交易內時不會重試。
+
+        func: :class:`Callable`
+            要執行之函數。
+
+        return: :class:`T`
+            函數之回傳值。
+        """
+        if getattr(self._local, "active", None) != None:
+            return func(*args, **kwargs)
+        for attempt in range(self._retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if attempt == self._retries or not is_busy(exc): raise
+                delay = 0.05 * (2 ** attempt) * (0.5 + random())
+                logger.warning(f"Database is busy, retry in {delay:.2f}s ({attempt + 1}/{self._retries}).")
+                sleep(delay)
+
+    def close(self) -> None:
+        """
+        關閉所有由連線池開啟之連線。
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for db in connections:
+            try: db.close()
+            except Exception: pass
+        self._local = local()
+        with self._shared_lock:
+            if self._shared != None:
+                self._shared.close()
+                self._shared = None
+
+def is_busy(exc: BaseException) -> bool:
+    """
+    檢查是否為資料庫鎖定錯誤。
+
+    exc: :class:`BaseException`
+        錯誤。
+
+    return: :class:`bool`
+    """
+    if not isinstance(exc, OperationalError): return False
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+POOL = ConnectionPool()
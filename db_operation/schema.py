@@ -0,0 +1,114 @@
+from .connection import POOL
+from modules import Json
+
+from logging import getLogger
+from sqlite3 import Connection
+
+logger = getLogger("main")
+
+# 資料庫結構版本
+# 0: 管理員與封禁清單以JSON文字儲存於各群組表格
+# 1: 管理員與封禁清單獨立為`channel_admins`與`channel_bans`表格
+# 2: 各群組表格合併為單一`channels`表格
+SCHEMA_VERSION = 2
+
+def _create_guild_table_v1(db: Connection, name: str) -> None:
+    db.execute(f"""
+        CREATE TABLE IF NOT EXISTS \"{name}\" (
+            "channel_id"	INTEGER NOT NULL UNIQUE,
+            "no_admin"	BLOB NOT NULL DEFAULT 1,
+            "last_admin"	INTEGER,
+            PRIMARY KEY("channel_id")
+        )
+    """)
+
+def create_tables(db: Connection) -> None:
+    """
+    創建頻道、管理員與封禁表格(若不存在)。
+
+    db: :class:`Connection`
+        資料庫連線。
+    """
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS "channels" (
+            "guild_id"	INTEGER NOT NULL,
+            "channel_id"	INTEGER NOT NULL,
+            "no_admin"	BLOB NOT NULL DEFAULT 1,
+            "last_admin"	INTEGER,
+            PRIMARY KEY("guild_id", "channel_id")
+        ) WITHOUT ROWID
+    """)
+    db.execute("CREATE UNIQUE INDEX IF NOT EXISTS \"channels_channel\" ON \"channels\" (\"channel_id\")")
+    for name in ("channel_admins", "channel_bans"):
+        db.execute(f"""
+            CREATE TABLE IF NOT EXISTS \"{name}\" (
+                "channel_id"	INTEGER NOT NULL,
+                "user_id"	INTEGER NOT NULL,
+                PRIMARY KEY("channel_id", "user_id")
+            ) WITHOUT ROWID
+        """)
+        db.execute(f"CREATE INDEX IF NOT EXISTS \"{name}_user\" ON \"{name}\" (\"user_id\")")
+
+def _guild_tables(db: Connection) -> list[str]:
+    cursor = db.execute("SELECT name FROM sqlite_master WHERE type=\"table\" AND name LIKE 'guild-%'")
+    return [name for name, in cursor.fetchall()]
+
+def _columns(db: Connection, name: str) -> set[str]:
+    return {row[1] for row in db.execute(f"PRAGMA table_info(\"{name}\")").fetchall()}
+
+def _migrate_v1(db: Connection) -> None:
+    # 將JSON清單拆分至獨立表格
+    create_tables(db)
+    for name in _guild_tables(db):
+        if "admin_list" not in _columns(db, name): continue
+        rows = db.execute(f"SELECT channel_id, admin_list, ban_list FROM \"{name}\"").fetchall()
+        for channel_id, admin_list, ban_list in rows:
+            db.executemany(
+                "INSERT OR IGNORE INTO channel_admins (channel_id, user_id) VALUES ($1, $2)",
+                [(channel_id, user_id) for user_id in Json.loads(admin_list)]
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO channel_bans (channel_id, user_id) VALUES ($1, $2)",
+                [(channel_id, user_id) for user_id in Json.loads(ban_list)]
+            )
+        # 重建群組表格以移除舊欄位
+        db.execute(f"ALTER TABLE \"{name}\" RENAME TO \"{name}-old\"")
+        _create_guild_table_v1(db, name)
+        db.execute(f"INSERT INTO \"{name}\" (channel_id, no_admin, last_admin) SELECT channel_id, no_admin, last_admin FROM \"{name}-old\"")
+        db.execute(f"DROP TABLE \"{name}-old\"")
+        logger.warning(f"Migrate table `{name}` to schema v1 ({len(rows)} channels).")
+
+def _migrate_v2(db: Connection) -> None:
+    # 將各群組表格合併至`channels`
+    create_tables(db)
+    for name in _guild_tables(db):
+        try: guild_id = int(name.removeprefix("guild-"))
+        except ValueError: continue
+        cursor = db.execute(f"""
+            INSERT OR IGNORE INTO channels (guild_id, channel_id, no_admin, last_admin)
+            SELECT $1, channel_id, no_admin, last_admin FROM \"{name}\"
+        """, (guild_id,))
+        db.execute(f"DROP TABLE \"{name}\"")
+        logger.warning(f"Merge table `{name}` into `channels` ({cursor.rowcount} channels).")
+
+def migrate() -> int:
+    """
+    檢查資料庫結構版本，若為舊版本則進行遷移。
+
+    return: :class:`int`
+        遷移前之結構版本。
+    """
+    return POOL.retry(_migrate)
+
+def _migrate() -> int:
+    # 先取得寫入鎖再讀取版本，避免多個程序同時遷移
+    with POOL.transaction() as db:
+        version: int = db.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return version
+        # 於同一交易內完成遷移
+        if version < 1: _migrate_v1(db)
+        if version < 2: _migrate_v2(db)
+        db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    return version
@@ -0,0 +1,305 @@
+from .aio import EXECUTOR
+from .backend import ChannelState, get_backend
+from .connection import POOL
+
+from asyncio import Event, Lock, Task, TimeoutError, create_task, shield, wait_for
+from logging import getLogger
+from threading import Lock as TLock
+from typing import Optional
+
+logger = getLogger("main")
+
+class ChannelStateStore:
+    """
+    頻道資料之記憶體快取。
+    所有讀取皆直接由記憶體回應，修改則先記錄於日誌，
+    每`flush_interval`秒或日誌長度達到`flush_threshold`時批次寫入儲存後端。
+    """
+    def __init__(self, flush_interval: float=5, flush_threshold: int=64) -> None:
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._tables: dict[int, dict[int, ChannelState]] = {}
+        # 已讀取之群組與讀取中之群組
+        self._loaded: set[int] = set()
+        self._loading: dict[int, Task] = {}
+        self._journal: list[tuple[str, tuple]] = []
+        self._journal_lock = TLock()
+        self._flush_lock: Optional[Lock] = None
+        self._flush_event: Optional[Event] = None
+        self._task: Optional[Task] = None
+        self._stopping = False
+        # 指令權限檢查時頻道資料存在/不存在之次數
+        self.admin_hits = 0
+        self.admin_misses = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        尚未寫入資料庫之修改數量。
+        """
+        return len(self._journal)
+
+    def configure(self, flush_interval: float=None, flush_threshold: int=None) -> None:
+        """
+        設定寫入資料庫之頻率。
+
+        flush_interval: :class:`float`
+            寫入間隔(秒)。
+        flush_threshold: :class:`int`
+            日誌長度達到此數值時立即寫入。
+        """
+        if flush_interval != None: self._flush_interval = max(flush_interval, 0.1)
+        if flush_threshold != None: self._flush_threshold = max(flush_threshold, 1)
+
+    async def load(self, guild_id: int) -> None:
+        """
+        自資料庫讀取該群組所有頻道之資料，已讀取過之群組將會略過。
+        同一群組同時僅會讀取一次，讀取期間於記憶體中之修改將會保留。
+
+        guild_id: :class:`int`
+            群組ID。
+        """
+        if guild_id in self._loaded: return
+        task = self._loading.get(guild_id)
+        if task == None:
+            task = self._loading[guild_id] = create_task(self._load(guild_id))
+        await shield(task)
+
+    async def _load(self, guild_id: int) -> None:
+        try:
+            rows = await EXECUTOR.run(get_backend().get_channels, guild_id)
+            # 合併至既有資料，讀取期間新增之頻道以記憶體中之資料為準
+            table = self._tables.setdefault(guild_id, {})
+            for channel_id, admin_list, ban_list, no_admin, last_admin in rows:
+                if channel_id in table: continue
+                table[channel_id] = ChannelState(admin_list, ban_list, no_admin, last_admin)
+            self._loaded.add(guild_id)
+        finally:
+            self._loading.pop(guild_id, None)
+
+    def get(self, guild_id: int, channel_id: int) -> Optional[ChannelState]:
+        """
+        取得頻道資料。
+
+        guild_id: :class:`int`
+            群組ID。
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`ChannelState | None`
+            頻道資料，若不存在則為`None`。
+        """
+        table = self._tables.get(guild_id)
+        if table == None: return None
+        return table.get(channel_id)
+
+    def channel_ids(self, guild_id: int) -> list[int]:
+        """
+        取得該群組所有頻道之ID。
+
+        guild_id: :class:`int`
+            群組ID。
+
+        return: :class:`list[int]`
+        """
+        return list(self._tables.get(guild_id, {}).keys())
+
+    def _record(self, name: str, *args) -> None:
+        with self._journal_lock:
+            self._journal.append((name, args))
+            length = len(self._journal)
+        if length >= self._flush_threshold and self._flush_event != None:
+            self._flush_event.set()
+
+    def _ensure(self, guild_id: int, channel_id: int) -> ChannelState:
+        table = self._tables.setdefault(guild_id, {})
+        state = table.get(channel_id)
+        if state == None:
+            state = table[channel_id] = ChannelState()
+            self._record("new_channel", guild_id, channel_id)
+        return state
+
+    # 讀取
+    def get_admin(self, guild_id: int, channel_id: int) -> list[int]:
+        state = self.get(guild_id, channel_id)
+        return [] if state == None else list(state.admin_list)
+
+    def is_admin(self, guild_id: int, channel_id: int, user_id: int) -> bool:
+        state = self.get(guild_id, channel_id)
+        return state != None and user_id in state.admin_list
+
+    async def authorize(self, guild_id: int, channel_id: int, user_id: int) -> bool:
+        """
+        檢查使用者是否為頻道管理員，供指令權限檢查使用。
+        群組尚未讀取時先自資料庫讀取，並依頻道資料是否存在記錄命中/未命中。
+
+        guild_id: :class:`int`
+            群組ID。
+        channel_id: :class:`int`
+            頻道ID。
+        user_id: :class:`int`
+            使用者ID。
+
+        return: :class:`bool`
+        """
+        if guild_id not in self._loaded: await self.load(guild_id)
+        state = self.get(guild_id, channel_id)
+        if state == None:
+            self.admin_misses += 1
+            return False
+        self.admin_hits += 1
+        return user_id in state.admin_list
+
+    def get_ban(self, guild_id: int, channel_id: int) -> list[int]:
+        state = self.get(guild_id, channel_id)
+        return [] if state == None else list(state.ban_list)
+
+    def can_claim(self, guild_id: int, channel_id: int) -> bool:
+        state = self.get(guild_id, channel_id)
+        return state != None and state.no_admin
+
+    def last_admin(self, guild_id: int, channel_id: int) -> Optional[int]:
+        state = self.get(guild_id, channel_id)
+        return None if state == None else state.last_admin
+
+    # 修改
+    def new_channel(self, guild_id: int, channel_id: int) -> None:
+        self._ensure(guild_id, channel_id)
+
+    def delete_channel(self, guild_id: int, channel_id: int) -> None:
+        self._tables.get(guild_id, {}).pop(channel_id, None)
+        self._record("delete_channel", guild_id, channel_id)
+
+    def set_claim(self, guild_id: int, channel_id: int, can_claim: bool) -> None:
+        self._ensure(guild_id, channel_id).no_admin = can_claim
+        self._record("set_claim", guild_id, channel_id, can_claim)
+
+    def add_admin(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        state = self._ensure(guild_id, channel_id)
+        state.admin_list.add(user_id)
+        state.no_admin = False
+        self._record("add_admin", guild_id, channel_id, user_id)
+
+    @staticmethod
+    def _remove_admin(state: ChannelState, user_id: int) -> None:
+        if user_id in state.admin_list:
+            state.admin_list.remove(user_id)
+            state.last_admin = user_id
+        state.no_admin = len(state.admin_list) == 0
+
+    def remove_admin(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        self._remove_admin(self._ensure(guild_id, channel_id), user_id)
+        self._record("remove_admin", guild_id, channel_id, user_id)
+
+    def member_leave(self, guild_id: int, channel_id: int, user_id: int) -> tuple[bool, bool, Optional[int]]:
+        """
+        使用者離開頻道，移除其管理員身分並回傳前後狀態。
+
+        return: :class:`tuple[bool, bool, int | None]`
+            (離開前是否能夠請求成為管理員, 離開後是否能夠請求成為管理員, 上一位離開的管理員ID)。
+        """
+        state = self.get(guild_id, channel_id)
+        if state == None: return False, False, None
+        was_claimable = state.no_admin
+        self._remove_admin(state, user_id)
+        self._record("member_leave", guild_id, channel_id, user_id)
+        return was_claimable, state.no_admin, state.last_admin
+
+    def add_ban(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        self._ensure(guild_id, channel_id).ban_list.add(user_id)
+        self._record("add_ban", guild_id, channel_id, user_id)
+
+    def remove_ban(self, guild_id: int, channel_id: int, user_id: int) -> None:
+        self._ensure(guild_id, channel_id).ban_list.discard(user_id)
+        self._record("remove_ban", guild_id, channel_id, user_id)
+
+    # 寫入資料庫
+    def _drain(self) -> list[tuple[str, tuple]]:
+        with self._journal_lock:
+            journal, self._journal = self._journal, []
+        return journal
+
+    def _restore(self, journal: list[tuple[str, tuple]]) -> None:
+        with self._journal_lock:
+            self._journal[:0] = journal
+
+    @staticmethod
+    def _apply_once(journal: list[tuple[str, tuple]]) -> None:
+        # 於同一交易內依序執行
+        backend = get_backend()
+        with backend.transaction():
+            for name, args in journal:
+                getattr(backend, name)(*args)
+
+    @classmethod
+    def _apply(cls, journal: list[tuple[str, tuple]]) -> None:
+        # 交易失敗時已回滾，資料庫被其他程序鎖定時可整批重試
+        POOL.retry(cls._apply_once, journal)
+
+    def flush(self) -> int:
+        """
+        立即將日誌寫入資料庫(同步)。
+
+        return: :class:`int`
+            寫入之修改數量。
+        """
+        journal = self._drain()
+        if len(journal) == 0: return 0
+        try:
+            self._apply(journal)
+        except Exception:
+            self._restore(journal)
+            raise
+        return len(journal)
+
+    async def flush_async(self) -> int:
+        """
+        於資料庫工作線程將日誌寫入資料庫。
+
+        return: :class:`int`
+            寫入之修改數量。
+        """
+        if self._flush_lock == None: self._flush_lock = Lock()
+        async with self._flush_lock:
+            journal = self._drain()
+            if len(journal) == 0: return 0
+            try:
+                await EXECUTOR.run(self._apply, journal)
+            except Exception:
+                self._restore(journal)
+                raise
+            return len(journal)
+
+    async def _flush_loop(self) -> None:
+        while not self._stopping:
+            try: await wait_for(self._flush_event.wait(), self._flush_interval)
+            except TimeoutError: pass
+            self._flush_event.clear()
+            try:
+                count = await self.flush_async()
+                if count != 0: logger.debug(f"Flush {count} channel state changes.")
+            except Exception as exc:
+                logger.error(f"Flush channel state failed: {exc!r}")
+
+    def start(self) -> None:
+        """
+        啟動背景寫入工作，需於事件迴圈內呼叫。
+        """
+        if self._task != None and not self._task.done(): return
+        self._stopping = False
+        self._flush_event = Event()
+        self._task = create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """
+        停止背景寫入工作，並將剩餘之日誌寫入資料庫。
+        """
+        if self._task != None:
+            # 通知背景工作結束並等待其完成目前之寫入
+            self._stopping = True
+            self._flush_event.set()
+            await self._task
+            self._task = None
+        await self.flush_async()
+
+STATE = ChannelStateStore()
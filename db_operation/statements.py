@@ -0,0 +1,150 @@
+from sqlite3 import Connection, Cursor
+from threading import Lock
+from time import perf_counter
+from typing import Iterable, Optional
+
+class Statement:
+    """
+    具名之固定SQL指令，並記錄呼叫次數與累計耗時。
+    指令文字固定不變，因此於同一連線上可重複使用sqlite已編譯之指令。
+    """
+    __slots__ = ("name", "sql", "calls", "elapsed", "_lock")
+    def __init__(self, name: str, sql: str) -> None:
+        self.name = name
+        self.sql = sql
+        self.calls = 0
+        self.elapsed = 0.0
+        self._lock = Lock()
+
+    def _record(self, start: float) -> None:
+        elapsed = perf_counter() - start
+        with self._lock:
+            self.calls += 1
+            self.elapsed += elapsed
+
+    def execute(self, db: Connection, params: Iterable=()) -> Cursor:
+        start = perf_counter()
+        try: return db.execute(self.sql, params)
+        finally: self._record(start)
+
+    def executemany(self, db: Connection, params: Iterable[Iterable]) -> Cursor:
+        start = perf_counter()
+        try: return db.executemany(self.sql, params)
+        finally: self._record(start)
+
+    def fetchone(self, db: Connection, params: Iterable=()) -> Optional[tuple]:
+        start = perf_counter()
+        try: return db.execute(self.sql, params).fetchone()
+        finally: self._record(start)
+
+    def fetchall(self, db: Connection, params: Iterable=()) -> list[tuple]:
+        start = perf_counter()
+        try: return db.execute(self.sql, params).fetchall()
+        finally: self._record(start)
+
+    def __repr__(self) -> str:
+        return f"<Statement {self.name} calls={self.calls} elapsed={self.elapsed:.6f}s>"
+
+STATEMENTS: dict[str, Statement] = {}
+
+def statement(name: str, sql: str) -> Statement:
+    """
+    註冊具名SQL指令。
+
+    name: :class:`str`
+        指令名稱。
+    sql: :class:`str`
+        SQL指令。
+
+    return: :class:`Statement`
+    """
+    if name in STATEMENTS: raise ValueError(f"Statement `{name}` already exists.")
+    result = STATEMENTS[name] = Statement(name, " ".join(sql.split()))
+    return result
+
+def _where(keys: Iterable[str]) -> str:
+    return " AND ".join(f"{key}=?" for key in keys)
+
+def select(table: str, columns: Iterable[str], keys: Iterable[str]=()) -> str:
+    """
+    生成SELECT指令。
+    """
+    sql = f"SELECT {', '.join(columns)} FROM {table}"
+    where = _where(keys)
+    return f"{sql} WHERE {where}" if where else sql
+
+def insert(table: str, columns: Iterable[str], ignore: bool=False) -> str:
+    """
+    生成INSERT指令。
+    """
+    columns = tuple(columns)
+    verb = "INSERT OR IGNORE" if ignore else "INSERT"
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+def update(table: str, columns: Iterable[str], keys: Iterable[str]) -> str:
+    """
+    生成UPDATE指令，參數順序為欄位值後接條件值。
+    """
+    return f"UPDATE {table} SET {', '.join(f'{column}=?' for column in columns)} WHERE {_where(keys)}"
+
+def delete(table: str, keys: Iterable[str]) -> str:
+    """
+    生成DELETE指令。
+    """
+    return f"DELETE FROM {table} WHERE {_where(keys)}"
+
+def statement_stats() -> list[tuple[str, int, float]]:
+    """
+    取得各指令之統計，依累計耗時由大到小排序。
+
+    return: :class:`list[tuple[str, int, float]]`
+        (指令名稱, 呼叫次數, 累計耗時(秒))之清單。
+    """
+    result = [(item.name, item.calls, item.elapsed) for item in STATEMENTS.values()]
+    result.sort(key=lambda item: item[2], reverse=True)
+    return result
+
+def reset_stats() -> None:
+    """
+    重設所有指令之統計。
+    """
+    for item in STATEMENTS.values():
+        with item._lock:
+            item.calls = 0
+            item.elapsed = 0.0
+
+# 頻道
+CHANNEL_KEY = ("guild_id", "channel_id")
+SELECT_CHANNELS = statement("select_channels", select("channels", ("channel_id", "no_admin", "last_admin"), ("guild_id",)))
+SELECT_NO_ADMIN = statement("select_no_admin", select("channels", ("no_admin",), CHANNEL_KEY))
+SELECT_LAST_ADMIN = statement("select_last_admin", select("channels", ("last_admin",), CHANNEL_KEY))
+SELECT_CLAIM_STATE = statement("select_claim_state", select("channels", ("no_admin", "last_admin"), CHANNEL_KEY))
+INSERT_CHANNEL = statement("insert_channel", insert("channels", CHANNEL_KEY, ignore=True))
+DELETE_CHANNEL = statement("delete_channel", delete("channels", CHANNEL_KEY))
+UPDATE_NO_ADMIN = statement("update_no_admin", update("channels", ("no_admin",), CHANNEL_KEY))
+UPDATE_LAST_ADMIN = statement("update_last_admin", update("channels", ("last_admin",), CHANNEL_KEY))
+REFRESH_NO_ADMIN = statement("refresh_no_admin", """
+    UPDATE channels SET no_admin=NOT EXISTS (SELECT 1 FROM channel_admins WHERE channel_id=?1)
+    WHERE guild_id=?2 AND channel_id=?1
+""")
+
+# 管理員
+MEMBER_KEY = ("channel_id", "user_id")
+SELECT_GUILD_ADMINS = statement("select_guild_admins", """
+    SELECT m.channel_id, m.user_id FROM channel_admins AS m
+    JOIN channels AS c USING(channel_id) WHERE c.guild_id=?
+""")
+SELECT_ADMINS = statement("select_admins", select("channel_admins", ("user_id",), ("channel_id",)))
+INSERT_ADMIN = statement("insert_admin", insert("channel_admins", MEMBER_KEY, ignore=True))
+DELETE_ADMIN = statement("delete_admin", delete("channel_admins", MEMBER_KEY))
+DELETE_CHANNEL_ADMINS = statement("delete_channel_admins", delete("channel_admins", ("channel_id",)))
+
+# 封禁
+SELECT_GUILD_BANS = statement("select_guild_bans", """
+    SELECT m.channel_id, m.user_id FROM channel_bans AS m
+    JOIN channels AS c USING(channel_id) WHERE c.guild_id=?
+""")
+SELECT_BANS = statement("select_bans", select("channel_bans", ("user_id",), ("channel_id",)))
+INSERT_BAN = statement("insert_ban", insert("channel_bans", MEMBER_KEY, ignore=True))
+DELETE_BAN = statement("delete_ban", delete("channel_bans", MEMBER_KEY))
+DELETE_CHANNEL_BANS = statement("delete_channel_bans", delete("channel_bans", ("channel_id",)))
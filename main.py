@@ -1,152 +1,235 @@
-from configs import DISCORD_CHANNEL, DISCORD_GUILD, DISCORD_LOGGER as LOG, DISCORD_TOKEN
+from configs import BACKUP_CONFIG, DATABASE_CONFIG, DISCORD_GUILDS, DISCORD_LOGGER as LOG, DISCORD_TOKEN, JOIN_CONFIG, SHARDING_CONFIG
 from configs.config import DISCORD_PREFIXS
 import db_operation as dbo
+from db_operation import aio as adbo
+import voice_operation as vo
 from commands import *
+from modules import CommandTokenizer
 
-from asyncio import sleep as a_sleep
+from argparse import ArgumentParser
+from asyncio import Task, create_task
+from time import perf_counter
 from typing import Optional
 
-from discord import ApplicationContext, CategoryChannel, Intents, Member, Message, PermissionOverwrite, SlashCommandGroup, VoiceChannel, VoiceState
+from discord import ApplicationContext, CategoryChannel, Intents, Member, Message, NotFound, PermissionOverwrite, SlashCommandGroup, VoiceChannel, VoiceState
 from discord.abc import GuildChannel
-from discord.bot import Bot
+from discord.bot import AutoShardedBot, Bot
+
+dbo.POOL.configure(DATABASE_CONFIG.PATH, DATABASE_CONFIG.POOL, DATABASE_CONFIG.PRAGMAS, DATABASE_CONFIG.BUSY_RETRIES)
+dbo.use_backend(DATABASE_CONFIG.BACKEND)
+adbo.EXECUTOR.configure(DATABASE_CONFIG.WORKERS, DATABASE_CONFIG.MAX_PENDING)
+dbo.STATE.configure(DATABASE_CONFIG.FLUSH_INTERVAL, DATABASE_CONFIG.FLUSH_THRESHOLD)
+dbo.BACKUP.configure(BACKUP_CONFIG.DIR_PATH, BACKUP_CONFIG.INTERVAL, BACKUP_CONFIG.RETENTION, BACKUP_CONFIG.PAGES)
+vo.JOIN_PIPELINE.configure(JOIN_CONFIG.CONCURRENCY)
+for guild_config in DISCORD_GUILDS:
+    vo.GUILDS.register(guild_config.GUILD_ID, guild_config.CHANNEL_ID, guild_config.CATEGORY_ID, JOIN_CONFIG.POOL_SIZE)
+vo.DELETIONS.configure(JOIN_CONFIG.DELETE_GRACE)
+vo.BATCH.configure(JOIN_CONFIG.BATCH_CONCURRENCY)
+vo.SCHEDULER.configure(JOIN_CONFIG.REST_CONCURRENCY, JOIN_CONFIG.ROUTE_LIMITS)
+# 指令解析器
+TOKENIZER = CommandTokenizer(DISCORD_PREFIXS)
 
 def gen_command_template(command: str) -> str:
     return "|".join(map(lambda prefix: f"{prefix}{command}", DISCORD_PREFIXS))
 
-def _not_dvc_embed_generator(author: Member) -> Embed:
+def _grant_admin(permission: PermissionOverwrite) -> PermissionOverwrite:
     """
-    不是動態語音頻道Embed生成器。
+    開啟管理員權限: 管理頻道、將他人靜音、將他人拒聽、管理訊息。
 
-    author: :class:`Member`
-        作者。
+    permission: :class:`PermissionOverwrite`
+        原權限。
 
-    return: :class:`Embed`
-        生成之Embed。
+    return: :class:`PermissionOverwrite`
+        修改後之權限。
     """
-    embed = Embed(
-        color=0xff0000,
-        title="發生錯誤!",
-        description="你不在動態語音頻道內。",
-        timestamp=datetime.now(TIMEZONE)
-    )
-    # 作者
-    embed.set_author(
-        name=author.display_name,
-        icon_url=author.display_avatar.url
-    )
-    return embed
-
-class DiscordClient(Bot):
+    permission.manage_channels = True
+    permission.mute_members = True
+    permission.deafen_members = True
+    permission.manage_messages = True
+    return permission
+
+# 分片模式: none為單一連線，auto由Discord決定分片數量，range僅負責指定之分片
+_BaseBot = Bot if SHARDING_CONFIG.MODE == "none" else AutoShardedBot
+
+class DiscordClient(_BaseBot):
     def __init__(self, *args, **kwargs):
         intents = Intents.all()
+        if SHARDING_CONFIG.MODE == "range":
+            kwargs.setdefault("shard_count", SHARDING_CONFIG.SHARD_COUNT)
+            kwargs.setdefault("shard_ids", list(SHARDING_CONFIG.SHARD_IDS) or None)
         super().__init__(*args, **kwargs, intents=intents)
 
-        self.command_group = self.create_group("dvc", guild_ids=[DISCORD_GUILD])
+        # 移除不屬於本程序分片之群組
+        for state in vo.GUILDS:
+            if not self._owns_guild(state.guild_id): vo.GUILDS.remove(state.guild_id)
+
+        # 背景送出中之通知訊息
+        self._notifications: set[Task] = set()
+
+        self.command_group = self.create_group("dvc", guild_ids=[state.guild_id for state in vo.GUILDS])
 
         self._dvc_command_init()
     
+    def _owns_guild(self, guild_id: int) -> bool:
+        shard_ids = getattr(self, "shard_ids", None)
+        if shard_ids == None: return True
+        return (guild_id >> 22) % self.shard_count in shard_ids
+
     def _dvc_command_init(self):
-        @self.command_group.command(name="help", description="指令說明")
+        @self.command_group.command(name="help", description=COMMANDS["help"].description)
         async def s_help(app_context: ApplicationContext, command: str):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Help.execute(self.table_name, app_context, (command))
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="name", description="改變你的語音頻道名稱")
+            await self._run_slash(app_context, "help", (command,))
+        @self.command_group.command(name="name", description=COMMANDS["name"].description)
         async def s_name(app_context: ApplicationContext, name: str):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Name.execute(self.table_name, app_context, (name,))
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="limit", description="改變頻道限制人數")
+            await self._run_slash(app_context, "name", (name,))
+        @self.command_group.command(name="limit", description=COMMANDS["limit"].description)
         async def s_limit(app_context: ApplicationContext, num: str):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Limit.execute(self.table_name, app_context, (num,))
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="bitrate", description="改變頻道的位元率")
+            await self._run_slash(app_context, "limit", (num,))
+        @self.command_group.command(name="bitrate", description=COMMANDS["bitrate"].description)
         async def s_bitrate(app_context: ApplicationContext, num: str):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await BitRate.execute(self.table_name, app_context, (num,))
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="hide", description="將語音頻道隱藏，其他使用者無法看見該頻道")
+            await self._run_slash(app_context, "bitrate", (num,))
+        @self.command_group.command(name="hide", description=COMMANDS["hide"].description)
         async def s_hide(app_context: ApplicationContext):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Hide.execute(self.table_name, app_context)
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="unhide", description="將語音頻道設為可見")
+            await self._run_slash(app_context, "hide")
+        @self.command_group.command(name="unhide", description=COMMANDS["unhide"].description)
         async def s_unhide(app_context: ApplicationContext):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await UnHide.execute(self.table_name, app_context)
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="lock", description="將頻道上鎖，其他使用者無法加入")
+            await self._run_slash(app_context, "unhide")
+        @self.command_group.command(name="lock", description=COMMANDS["lock"].description)
         async def s_lock(app_context: ApplicationContext):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Lock.execute(self.table_name, app_context)
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="unlock", description="將頻道解鎖，其他使用者可以加入")
+            await self._run_slash(app_context, "lock")
+        @self.command_group.command(name="unlock", description=COMMANDS["unlock"].description)
         async def s_unlock(app_context: ApplicationContext):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await UnLock.execute(self.table_name, app_context)
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="kick", description="踢出語音頻道內的某個使用者")
+            await self._run_slash(app_context, "unlock")
+        @self.command_group.command(name="privacy", description=COMMANDS["privacy"].description)
+        async def s_privacy(app_context: ApplicationContext, profile: str):
+            await self._run_slash(app_context, "privacy", (profile,))
+        @self.command_group.command(name="kick", description=COMMANDS["kick"].description)
         async def s_kick(app_context: ApplicationContext, tags: str):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Kick.execute(self.table_name, app_context, self._metion_decode(tags))
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="ban", description="驅逐某個使用者")
+            await self._run_slash(app_context, "kick", (tags,))
+        @self.command_group.command(name="ban", description=COMMANDS["ban"].description)
         async def s_ban(app_context: ApplicationContext, tags: str):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Ban.execute(self.table_name, app_context, self._metion_decode(tags))
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="unban", description="解除驅逐某個使用者")
+            await self._run_slash(app_context, "ban", (tags,))
+        @self.command_group.command(name="unban", description=COMMANDS["unban"].description)
         async def s_unban(app_context: ApplicationContext, tags: str):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await UnBan.execute(self.table_name, app_context, self._metion_decode(tags))
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="mute", description="禁止所有人說話")
+            await self._run_slash(app_context, "unban", (tags,))
+        @self.command_group.command(name="mute", description=COMMANDS["mute"].description)
         async def s_mute(app_context: ApplicationContext):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await Mute.execute(self.table_name, app_context)
-            await app_context.respond(**ret, ephemeral=True)
-        @self.command_group.command(name="unmute", description="允許所有人說話")
+            await self._run_slash(app_context, "mute")
+        @self.command_group.command(name="unmute", description=COMMANDS["unmute"].description)
         async def s_unmute(app_context: ApplicationContext):
-            if app_context.channel.category != self.category: ret = {"embed": _not_dvc_embed_generator(app_context.author)}
-            else: ret = await UnMute.execute(self.table_name, app_context)
-            await app_context.respond(**ret, ephemeral=True)
+            await self._run_slash(app_context, "unmute")
     
-    def _metion_decode(self, raw_text: str) -> tuple[Member]:
-        result = []
-        format_list = raw_text.split(">")
-        for tag in format_list:
-            if "@" not in tag: continue
-            try:
-                user_id = int(tag.strip("<@!>"))
-                member = self.initial_channel.guild.get_member(user_id)
-                if member == None: continue
-                result.append(member)
-            except: continue
-        return tuple(member)
-    
-    async def _add_admin(self, channel: VoiceChannel, member: Member):
-        guild = member.guild         # 群組
-        table_name = self.table_name # 資料庫表格名稱
+    async def _run_slash(self, app_context: ApplicationContext, name: str, args: Optional[tuple]=None) -> None:
+        # 先延後回應，避免指令等待限流時超過互動之回應期限
+        await app_context.defer(ephemeral=True)
+        await COMMAND_PIPELINE.run(CommandContext(app_context, name, args))
+
+    def _notify(self, channel: VoiceChannel, content: str) -> None:
+        # 通知訊息於背景送出，避免持有頻道鎖時等待限流
+        task = create_task(vo.SCHEDULER.request(vo.NOTIFICATION, "send_message", channel.id, channel.send, content))
+        self._notifications.add(task)
+        task.add_done_callback(self._notified)
+
+    def _notified(self, task: Task) -> None:
+        self._notifications.discard(task)
+        if task.cancelled() or task.exception() == None: return
+        LOG.warning(f"Send notification failed: {task.exception()!r}.")
+
+    async def _add_admin(self, state: vo.GuildState, channel: VoiceChannel, member: Member):
+        guild = member.guild           # 群組
+        guild_key = state.guild_key    # 資料庫群組鍵值
 
         # 開啟權限: 管理頻道、將他人靜音、將他人拒聽、管理訊息
-        permission = channel.overwrites_for(member)
-        permission.manage_channels = True
-        permission.mute_members = True
-        permission.deafen_members = True
-        permission.manage_messages = True
+        permission = _grant_admin(channel.overwrites_for(member))
 
         # 更新權限
-        await channel.set_permissions(member, overwrite=permission)
+        await vo.SCHEDULER.request(vo.LIFECYCLE, "edit_channel", channel.id, channel.set_permissions, member, overwrite=permission)
 
         # 更新資料庫
-        dbo.add_admin(table_name, channel.id, member.id)
+        dbo.STATE.add_admin(guild_key, channel.id, member.id)
 
         LOG.info(f"Add user<{guild.id}/{member.id}> to channel<{channel.id}> admin.")
     
-    async def _remove_admin(self, channel: VoiceChannel, member: Member):
-        guild = member.guild         # 群組
-        table_name = self.table_name # 資料庫表格名稱
+    async def _create_channel(self, state: vo.GuildState, member: Member) -> VoiceChannel:
+        name = member.display_name     # 使用者名稱
+        guild = member.guild           # 群組
+        guild_key = state.guild_key    # 資料庫群組鍵值
+        category = state.category      # 動態語音類別
+
+        # 給予管理員權限，並與頻道創建/修改一併送出，省去額外之權限設定
+        overwrites = dict(category.overwrites)
+        overwrites[member] = _grant_admin(overwrites.get(member, PermissionOverwrite()))
+        new_channel = state.pool.take()
+        if new_channel != None:
+            # 取用備用頻道: 重新命名、取消隱藏並給予管理員權限
+            try:
+                await vo.SCHEDULER.request(vo.INTERACTIVE, "edit_channel", new_channel.id, new_channel.edit, name=f"{name} 的語音頻道", overwrites=overwrites)
+                LOG.info(f"Claim spare channel<{guild.id}/{new_channel.id}>`{new_channel.name}`.")
+            except NotFound:
+                # 備用頻道已被刪除
+                new_channel = None
+        if new_channel == None:
+            # 創建新頻道
+            with vo.OWNERSHIP.creating():
+                new_channel = await vo.SCHEDULER.request(vo.INTERACTIVE, "create_channel", guild.id, category.create_voice_channel, f"{name} 的語音頻道", overwrites=overwrites)
+                vo.OWNERSHIP.register(new_channel.id)
+            LOG.info(f"Create channel<{guild.id}/{new_channel.id}>`{new_channel.name}`.")
+
+        async with vo.CHANNEL_LOCKS.lock(new_channel.id):
+            # 新增資料至資料庫
+            dbo.STATE.new_channel(guild_key, new_channel.id)
+            dbo.STATE.add_admin(guild_key, new_channel.id, member.id)
+            LOG.info(f"Add user<{guild.id}/{member.id}> to channel<{new_channel.id}> admin.")
+
+            # 將使用者移動至該頻道
+            await vo.SCHEDULER.request(vo.INTERACTIVE, "move_member", guild.id, member.move_to, new_channel)
+        return new_channel
+
+    async def _create_spare(self, state: vo.GuildState) -> VoiceChannel:
+        category = state.category   # 動態語音類別
+        guild = category.guild      # 群組
+
+        # 創建隱藏之備用頻道，僅機器人可見
+        overwrites = dict(category.overwrites)
+        hidden = overwrites.get(guild.default_role, PermissionOverwrite())
+        hidden.view_channel = False
+        hidden.connect = False
+        overwrites[guild.default_role] = hidden
+        overwrites[guild.me] = PermissionOverwrite(view_channel=True, connect=True, manage_channels=True)
+        with vo.OWNERSHIP.creating():
+            channel = await vo.SCHEDULER.request(vo.LIFECYCLE, "create_channel", guild.id, category.create_voice_channel, vo.POOL_CHANNEL_NAME, overwrites=overwrites)
+            vo.OWNERSHIP.register(channel.id)
+        LOG.info(f"Create spare channel<{guild.id}/{channel.id}>.")
+        return channel
+
+    async def _reconcile(self, state: vo.GuildState) -> None:
+        category = state.category      # 動態語音類別
+        guild = category.guild         # 群組
+        guild_key = state.guild_key    # 資料庫群組鍵值
+
+        # 刪除停機期間留下之空頻道，並收回備用頻道
+        for channel in category.voice_channels:
+            if channel == state.initial_channel or len(channel.members) != 0: continue
+            # 備用頻道不會有頻道資料
+            if vo.is_spare(channel) and dbo.STATE.get(guild_key, channel.id) == None and state.pool.adopt(channel): continue
+            await vo.SCHEDULER.request(vo.LIFECYCLE, "delete_channel", guild.id, channel.delete)
+            LOG.info(f"Delete empty channel<{guild.id}/{channel.id}>`{channel.name}`.")
+        # 移除已不存在之頻道資料
+        existing = {channel.id for channel in category.voice_channels}
+        for channel_id in dbo.STATE.channel_ids(guild_key):
+            if channel_id not in existing: dbo.STATE.delete_channel(guild_key, channel_id)
+        # 補充備用頻道
+        state.pool.configure(factory=lambda: self._create_spare(state))
+        state.pool.refill()
+
+    async def _remove_admin(self, state: vo.GuildState, channel: VoiceChannel, member: Member) -> tuple[bool, bool, Optional[int]]:
+        guild = member.guild           # 群組
+        guild_key = state.guild_key    # 資料庫群組鍵值
+
+        # 更新資料庫，並取得離開前後是否能夠請求成為管理員
+        was_admin = dbo.STATE.is_admin(guild_key, channel.id, member.id)
+        result = dbo.STATE.member_leave(guild_key, channel.id, member.id)
+        if not was_admin: return result
 
         # 重設權限: 管理頻道、將他人靜音、將他人拒聽、管理訊息
         permission = channel.overwrites_for(member)
@@ -156,159 +239,191 @@ class DiscordClient(Bot):
         permission.manage_messages = None
 
         # 更新權限
-        await channel.set_permissions(member, overwrite=permission)
-
-        # 更新資料庫
-        dbo.remove_admin(table_name, channel.id, member.id)
+        await vo.SCHEDULER.request(vo.LIFECYCLE, "edit_channel", channel.id, channel.set_permissions, member, overwrite=permission)
 
         LOG.info(f"Remove user<{guild.id}/{member.id}> admin from channel<{channel.id}>.")
+        return result
     
-    async def on_ready(self):
+    async def _member_leave(self, state: vo.GuildState, channel: VoiceChannel, member: Member) -> None:
+        guild = member.guild   # 群組
+
+        # 如果離開者是管理員，則將其自管理員清單移除
+        # 並取得離開前後，頻道內其他人是否可以請求成為管理員
+        before_claim, after_claim, _ = await self._remove_admin(state, channel, member)
+        # 檢查請求成為管理員權限是否改變
+        if after_claim and after_claim != before_claim:
+            # 如果權限改變則開放請求成為新的管理員
+            self._notify(channel, f"由於本頻道原管理員`{member.display_name}`已離開頻道，因此開放其他人請求成為新管理員。\n請使用`{gen_command_template('claim')}`以請求成為新管理員。")
+            LOG.info(f"Channel<{guild.id}/{channel.id}>`{channel.name}` no admin.")
+
+    async def _delete_if_empty(self, channel: VoiceChannel) -> None:
+        async with vo.CHANNEL_LOCKS.lock(channel.id):
+            # 等待期間有人加入則保留頻道
+            if len(channel.members) != 0 or not vo.DELETIONS.claim(channel.id): return
+            await vo.SCHEDULER.request(vo.LIFECYCLE, "delete_channel", channel.guild.id, channel.delete)
+            LOG.info(f"Delete channel<{channel.guild.id}/{channel.id}>`{channel.name}`.")
+
+    async def _setup_guild(self, state: vo.GuildState) -> None:
         # 取得起始頻道
-        self.initial_channel: VoiceChannel = self.get_channel(DISCORD_CHANNEL)
-        # 起始頻道所屬之類別
-        self.category: Optional[CategoryChannel] = self.initial_channel.category
-        if self.category == None:
-            self.category = await self.initial_channel.guild.create_category("DVC Category")
-            await self.initial_channel.edit(category=self.category)
-        # 資料庫表格名稱
-        self.table_name = dbo.database_init(self.initial_channel.guild.id)
+        initial_channel: Optional[VoiceChannel] = self.get_channel(state.initial_channel_id)
+        if initial_channel == None:
+            LOG.error(f"Initial channel<{state.guild_id}/{state.initial_channel_id}> not found.")
+            return
+        # 動態語音類別，未設定時使用起始頻道所屬之類別
+        category: Optional[CategoryChannel] = self.get_channel(state.category_id) if state.category_id else initial_channel.category
+        if category == None and state.category_id:
+            LOG.error(f"Category<{state.guild_id}/{state.category_id}> not found.")
+            return
+        if category == None:
+            category = await initial_channel.guild.create_category("DVC Category")
+            await initial_channel.edit(category=category)
+        # 資料庫群組鍵值
+        guild_key = await adbo.database_init(initial_channel.guild.id)
+        # 讀取頻道資料，完成後才開始處理該群組之事件
+        await dbo.STATE.load(guild_key)
+        vo.GUILDS.bind(state, initial_channel, category, guild_key)
+        # 整理類別內之頻道
+        await self._reconcile(state)
+
+    async def on_ready(self):
+        # 初始化各群組
+        for state in vo.GUILDS:
+            await self._setup_guild(state)
+        # 啟動背景寫入
+        dbo.STATE.start()
+        # 定期線上備份(僅限SQLite後端，多程序時由負責分片0之程序進行)
+        if BACKUP_CONFIG.ENABLE and DATABASE_CONFIG.BACKEND == "sqlite" and self._owns_guild(0):
+            dbo.BACKUP.start()
 
         LOG.warning(f"Discord Bot `{self.user}` Start.")
     
     async def on_voice_state_update(self, member: Member, before: VoiceState, after: VoiceState):
-        name = member.display_name   # 使用者名稱
+        start = perf_counter()       # 事件開始時間
         guild = member.guild         # 群組
         l_channel = before.channel   # 離該的頻道
         j_channel = after.channel    # 加入的頻道
-        table_name = self.table_name # 資料庫表格名稱
 
         if l_channel != None:
-            l_in_category = l_channel.category == self.category
+            l_state = vo.GUILDS.for_voice(l_channel)
             if j_channel != None:
-                j_in_category = j_channel.category == self.category
+                j_state = vo.GUILDS.for_voice(j_channel)
                 LOG.info(f"User<{guild.id}/{member.id}> <{l_channel.id}> -> <{j_channel.id}>.")
             else:
-                j_in_category = False
+                j_state = None
                 LOG.info(f"User<{guild.id}/{member.id}> <{l_channel.id}> -> ")
         else:
-            l_in_category = False
-            j_in_category = j_channel.category == self.category
+            l_state = None
+            j_state = vo.GUILDS.for_voice(j_channel)
             LOG.info(f"User<{guild.id}/{member.id}> -> <{j_channel.id}>")
 
         # 檢查是否是從起始頻道離開
-        if l_channel == self.initial_channel: return
+        if l_state != None and l_channel == l_state.initial_channel: return
         
         # 檢查是否加入了起始頻道
-        if j_channel == self.initial_channel:
-            # 創建新頻道
-            new_channel = await self.category.create_voice_channel(f"{name} 的語音頻道")
-            LOG.info(f"Create channel<{guild.id}/{new_channel.id}>`{new_channel.name}`.")
-            # 將使用者移動至該頻道
-            await member.move_to(new_channel)
-
-            # 新增資料至資料庫
-            dbo.new_channel(table_name, new_channel.id)
-            await self._add_admin(new_channel, member)
+        if j_state != None and j_channel == j_state.initial_channel:
+            # 創建新頻道並將使用者移入
+            await vo.JOIN_PIPELINE.submit(self._create_channel, j_state, member, start=start)
             return
         
         # 檢查使用者是否為該頻道最後一位離開的管理員
-        if j_in_category:
-            if dbo.can_claim(table_name, j_channel.id) and member.id == dbo.last_admin(table_name, j_channel.id):
-                # 如果是，則恢復其管理員權限
-                await self._add_admin(j_channel, member)
-                await j_channel.send(f"本頻道原管理員`{member.display_name}`已加回頻道，因此恢復其管理員身分。")
-                LOG.info(f"Channel<{guild.id}/{j_channel.id}>`{j_channel.name}` admin return.")
+        if j_state != None:
+            guild_key = j_state.guild_key   # 資料庫群組鍵值
+            async with vo.CHANNEL_LOCKS.lock(j_channel.id):
+                # 取消等待中之刪除並沿用該頻道
+                if vo.DELETIONS.cancel(j_channel.id):
+                    LOG.info(f"Cancel deleting channel<{guild.id}/{j_channel.id}>`{j_channel.name}`.")
+                    # 清空時仍在清單中之管理員已不在頻道內，視為離開
+                    for admin_id in dbo.STATE.get_admin(guild_key, j_channel.id):
+                        if admin_id == member.id: continue
+                        admin = guild.get_member(admin_id)
+                        if admin == None: dbo.STATE.member_leave(guild_key, j_channel.id, admin_id)
+                        else: await self._member_leave(j_state, j_channel, admin)
+                if dbo.STATE.can_claim(guild_key, j_channel.id) and member.id == dbo.STATE.last_admin(guild_key, j_channel.id):
+                    # 如果是，則恢復其管理員權限
+                    await self._add_admin(j_state, j_channel, member)
+                    self._notify(j_channel, f"本頻道原管理員`{member.display_name}`已加回頻道，因此恢復其管理員身分。")
+                    LOG.info(f"Channel<{guild.id}/{j_channel.id}>`{j_channel.name}` admin return.")
         
-        if l_in_category:
-            # 檢查離該的頻道內是否還有人
-            if len(l_channel.members) == 0:
-                # 如果沒有人，則刪除頻道
-                await l_channel.delete()
-                LOG.info(f"Delete channel<{guild.id}/{l_channel.id}>`{l_channel.name}`.")
-            else:
-                # 記錄在離開前，頻道內其他人是否可以請求成為管理員
-                before_claim = dbo.can_claim(table_name, l_channel.id)
-                # 如果離開者是管理員，則將其自管理員清單移除
-                await self._remove_admin(l_channel, member)
-                # 檢查請求成為管理員權限是否改變
-                after_claim = dbo.can_claim(table_name, l_channel.id)
-                if after_claim and after != before_claim:
-                    # 如果權限改變則開放請求成為新的管理員
-                    await l_channel.send(f"由於本頻道原管理員`{member.display_name}`已離開頻道，因此開放其他人請求成為新管理員。\n請使用`{gen_command_template('claim')}`以請求成為新管理員。")
-                    LOG.info(f"Channel<{guild.id}/{l_channel.id}>`{l_channel.name}` no admin.")
+        if l_state != None and not l_state.pool.is_pooled(l_channel.id):
+            async with vo.CHANNEL_LOCKS.lock(l_channel.id):
+                # 檢查離該的頻道內是否還有人
+                if len(l_channel.members) == 0:
+                    # 如果沒有人，則於等待時間後刪除頻道
+                    vo.DELETIONS.schedule(l_channel.id, lambda: self._delete_if_empty(l_channel))
+                else:
+                    await self._member_leave(l_state, l_channel, member)
     
     async def on_guild_channel_create(self, channel: VoiceChannel):
-        if channel.category != self.category or type(channel) != VoiceChannel: return
-        # 新增至資料庫
-        dbo.new_channel(self.table_name, channel.id)
-        # 檢查是否由機器人創建
-        await a_sleep(10)
-        if dbo.can_claim(self.table_name, channel.id):
-            # 如果否，則開放請求成為管理員之權限
-            await channel.send(f"由於本頻道無管理員，因此開放其他人請求成為新管理員。\n請使用`{gen_command_template('claim')}`以請求成為新管理員。")
-            LOG.info(f"Channel<{channel.guild.id}/{channel.id}>`{channel.name}` no admin.")
+        state = vo.GUILDS.for_channel(channel)   # 群組狀態
+        if state == None or type(channel) != VoiceChannel: return
+        # 檢查是否由機器人創建(包含備用頻道)
+        if vo.is_spare(channel) or await vo.OWNERSHIP.is_owned(channel.id): return
+        async with vo.CHANNEL_LOCKS.lock(channel.id):
+            # 新增至資料庫
+            dbo.STATE.new_channel(state.guild_key, channel.id)
+            if dbo.STATE.can_claim(state.guild_key, channel.id):
+                # 非機器人創建之頻道，開放請求成為管理員之權限
+                self._notify(channel, f"由於本頻道無管理員，因此開放其他人請求成為新管理員。\n請使用`{gen_command_template('claim')}`以請求成為新管理員。")
+                LOG.info(f"Channel<{channel.guild.id}/{channel.id}>`{channel.name}` no admin.")
 
     async def on_guild_channel_delete(self, channel: GuildChannel):
-        if channel.category != self.category or type(channel) != VoiceChannel: return
+        state = vo.GUILDS.for_channel(channel)   # 群組狀態
+        if state == None or type(channel) != VoiceChannel: return
+        # 若為備用頻道則自備用頻道移除，並取消等待中之刪除
+        state.pool.discard(channel.id)
+        vo.DELETIONS.discard(channel.id)
+        vo.OWNERSHIP.release(channel.id)
         # 自資料庫移除資料
-        dbo.delete_channel(self.table_name, channel.id)
+        dbo.STATE.delete_channel(state.guild_key, channel.id)
     
     async def on_message(self, message: Message):
         # 檢查是否為無效命令
-        if message.author == self.user: return                 # 由自己發出的訊息
-        elif message.author.bot: return                        # 由機器人發出的訊息
-        elif message.channel.category != self.category: return # 在動態語音類別外的訊息
-        elif message.channel == self.initial_channel: return   # 在起始頻道的訊息
-
-        command = message.content.strip().lower() # 修飾指令
-        table_name = self.table_name              # 資料庫表格名稱
-        # 檢查是否為命令
-        if not command.startswith(DISCORD_PREFIXS): return
-        # 移除指令前墜
-        for preifx in DISCORD_PREFIXS:
-            command = command.removeprefix(preifx)
-        # 切分指令
-        _res = command.split(" ")
-        if len(_res) < 2:
-            command, args = _res[0], None
-        else:
-            command, args = _res[0], tuple(_res[1:])
-        # 判斷指令
-        ret = None
-        if command == "help":
-            ret = await Help.execute(table_name, message, args)
-        if command == "name":
-            ret = await Name.execute(table_name, message, args)
-        elif command == "limit":
-            ret = await Limit.execute(table_name, message, args)
-        elif command == "limit":
-            ret = await BitRate.execute(table_name, message, args)
-        elif command == "hide":
-            ret = await Hide.execute(table_name, message, args)
-        elif command == "unhide":
-            ret = await UnHide.execute(table_name, message, args)
-        elif command == "lock":
-            ret = await Lock.execute(table_name, message, args)
-        elif command == "unlock":
-            ret = await UnLock.execute(table_name, message, args)
-        elif command == "kick":
-            ret = await Kick.execute(table_name, message, args)
-        elif command == "ban":
-            ret = await Ban.execute(table_name, message, args)
-        elif command == "unban":
-            ret = await UnBan.execute(table_name, message, args)
-        elif command == "mute":
-            ret = await Mute.execute(table_name, message, args)
-        elif command == "unmute":
-            ret = await UnMute.execute(table_name, message, args)
-        if ret: await message.reply(**ret)
+        if message.author == self.user: return  # 由自己發出的訊息
+        elif message.author.bot: return         # 由機器人發出的訊息
+        # 動態語音類別與起始頻道之檢查由指令管線處理
+        # 解析指令，非指令訊息直接略過
+        token = TOKENIZER.tokenize(message.content)
+        if token == None: return
+        await COMMAND_PIPELINE.run(CommandContext(message, *token))
     
+    async def close(self) -> None:
+        await super().close()
+        vo.DELETIONS.stop()
+        await dbo.BACKUP.stop()
+        # 將剩餘之修改寫入資料庫，並等待資料庫工作完成
+        await dbo.STATE.stop()
+        adbo.EXECUTOR.shutdown()
+        # 記錄加入起始頻道至移入新頻道之延遲
+        LOG.info(f"Join-to-moved latency: {vo.JOIN_PIPELINE.latency.summary()}.")
+        hits, misses = sum(state.pool.hits for state in vo.GUILDS), sum(state.pool.misses for state in vo.GUILDS)
+        LOG.info(f"Spare channels: {hits} hits, {misses} misses.")
+        LOG.info(f"Channel locks: {vo.CHANNEL_LOCKS.summary()}.")
+        LOG.info(f"Command stages: {COMMAND_PIPELINE.summary()}.")
+        LOG.info(f"Admin checks: {dbo.STATE.admin_hits} with channel state, {dbo.STATE.admin_misses} without.")
+        LOG.info(f"REST scheduler: {vo.SCHEDULER.summary()}.")
+        LOG.info(f"Member batches: {vo.BATCH.succeeded} succeeded, {vo.BATCH.failed} failed.")
+        LOG.info(f"Channel deletions: {vo.DELETIONS.scheduled} scheduled, {vo.DELETIONS.cancelled} cancelled by rejoin, {vo.DELETIONS.executed} executed.")
+        # 記錄各資料庫指令之統計
+        for name, calls, elapsed in dbo.statement_stats():
+            if calls == 0: continue
+            LOG.info(f"Statement `{name}`: {calls} calls, {elapsed * 1000:.1f}ms total, {elapsed / calls * 1e6:.1f}us avg.")
+
     def run(self, *args, **kwargs) -> None:
+        # 檢查資料庫結構，若為舊版本則進行遷移
+        dbo.get_backend().migrate()
         return super().run(DISCORD_TOKEN, *args, **kwargs)
 
 if __name__ == "__main__":
-    client = DiscordClient()
+    parser = ArgumentParser()
+    parser.add_argument("--shard-count", type=int, help="分片總數(range模式)。")
+    parser.add_argument("--shard-ids", type=lambda text: [int(shard_id) for shard_id in text.split(",")], help="本程序負責之分片，以逗號分隔(range模式)。")
+    args = parser.parse_args()
+
+    kwargs = {}
+    if SHARDING_CONFIG.MODE == "range":
+        if args.shard_count != None: kwargs["shard_count"] = args.shard_count
+        if args.shard_ids != None: kwargs["shard_ids"] = args.shard_ids
+    client = DiscordClient(**kwargs)
     try:
         client.run()
     except KeyboardInterrupt:
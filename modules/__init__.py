@@ -1,2 +1,7 @@
 from .threading_ import *
 from .json import *
+from .ratelimit import *
+from .stats import *
+from .locks import *
+from .tokenizer import *
+from .pipeline import *
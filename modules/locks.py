@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import AsyncIterator, Hashable
+from weakref import WeakValueDictionary
+
+from .stats import LatencyRecorder
+
+class _KeyLock:
+    __slots__ = ("lock", "waiters", "__weakref__")
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.waiters = 0
+
+class KeyedLock:
+    """
+    依鍵值區分之非同步鎖。
+    相同鍵值之工作依序執行，不同鍵值之工作互不影響。
+    閒置之鍵值不會被保留，鎖於無人使用後自動回收。
+    """
+    def __init__(self) -> None:
+        self._locks: WeakValueDictionary[Hashable, _KeyLock] = WeakValueDictionary()
+        self.acquisitions = 0
+        self.contended = 0
+        self.max_depth = 0
+        self.wait = LatencyRecorder()
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def depth(self, key: Hashable) -> int:
+        """
+        取得該鍵值等待中之工作數量。
+
+        key: :class:`Hashable`
+            鍵值。
+
+        return: :class:`int`
+        """
+        entry = self._locks.get(key)
+        return 0 if entry == None else entry.waiters
+
+    def locked(self, key: Hashable) -> bool:
+        """
+        檢查該鍵值是否已被鎖定。
+
+        key: :class:`Hashable`
+            鍵值。
+
+        return: :class:`bool`
+        """
+        entry = self._locks.get(key)
+        return entry != None and entry.lock.locked()
+
+    @asynccontextmanager
+    async def lock(self, key: Hashable) -> AsyncIterator[None]:
+        """
+        鎖定該鍵值直到離開區塊。
+
+        key: :class:`Hashable`
+            鍵值。
+        """
+        # 持有強參照，避免使用中之鎖被回收
+        entry = self._locks.get(key)
+        if entry == None:
+            entry = self._locks[key] = _KeyLock()
+        start = perf_counter()
+        if entry.lock.locked():
+            self.contended += 1
+        entry.waiters += 1
+        self.max_depth = max(self.max_depth, entry.waiters)
+        try:
+            await entry.lock.acquire()
+        finally:
+            entry.waiters -= 1
+        self.acquisitions += 1
+        self.wait.record(perf_counter() - start)
+        try:
+            yield
+        finally:
+            entry.lock.release()
+
+    def summary(self) -> str:
+        """
+        取得爭用統計之摘要。
+
+        return: :class:`str`
+        """
+        return f"{self.acquisitions} acquisitions, {self.contended} contended, max depth {self.max_depth}, wait {self.wait.summary()}"
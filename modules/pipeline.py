@@ -0,0 +1,71 @@
+from .stats import LatencyRecorder
+
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Optional
+
+Stage = Callable[[Any], Awaitable[None]]
+
+class Pipeline:
+    """
+    中介層管線。
+    依序執行各階段並分別記錄其延遲；任一階段將`context.done`設為`True`後，
+    其餘階段將被略過(`always`之階段除外)。
+    """
+    def __init__(self) -> None:
+        self._stages: list[tuple[str, Stage, bool]] = []
+        self.latency: dict[str, LatencyRecorder] = {}
+
+    @property
+    def stages(self) -> tuple[str]:
+        """
+        各階段名稱。
+        """
+        return tuple(name for name, _, _ in self._stages)
+
+    def use(self, name: str, stage: Stage, always: bool=False, before: Optional[str]=None) -> None:
+        """
+        新增階段。
+
+        name: :class:`str`
+            階段名稱。
+        stage: :class:`Callable[[Any], Awaitable[None]]`
+            階段函式，接收上下文物件。
+        always: :class:`bool`
+            是否於其他階段結束流程後仍執行。
+        before: :class:`str`
+            插入於該階段之前，`None`表示加入至最後。
+        """
+        if name in self.latency: raise ValueError(f"Stage `{name}` already exists.")
+        index = len(self._stages) if before == None else self.stages.index(before)
+        self._stages.insert(index, (name, stage, always))
+        self.latency[name] = LatencyRecorder()
+
+    async def run(self, context: Any) -> Any:
+        """
+        以上下文物件執行管線。
+
+        context: :class:`Any`
+            上下文物件，須具有`done`屬性。
+
+        return: :class:`Any`
+            上下文物件。
+        """
+        for name, stage, always in self._stages:
+            if context.done and not always: continue
+            start = perf_counter()
+            try: await stage(context)
+            finally: self.latency[name].record(perf_counter() - start)
+        return context
+
+    def summary(self) -> str:
+        """
+        各階段延遲之摘要。
+        """
+        result = []
+        for name in self.stages:
+            recorder = self.latency[name]
+            if recorder.count == 0: result.append(f"{name} no samples"); continue
+            # 各階段多為微秒等級，以微秒表示
+            p50, p99 = recorder.percentile(50), recorder.percentile(99)
+            result.append(f"{name} n={recorder.count} p50={p50 * 1e6:.0f}us p99={p99 * 1e6:.0f}us")
+        return ", ".join(result)
@@ -0,0 +1,127 @@
+from asyncio import CancelledError, Future, TimerHandle, get_running_loop
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import Optional
+
+class TokenBucket:
+    """
+    令牌桶限流器。
+    每`per`秒最多允許`rate`次呼叫，超過時呼叫者將等待至有可用令牌；
+    等待者依優先等級(數字越小越優先，同等級依先後順序)取得令牌。
+    """
+    __slots__ = ("rate", "per", "_tokens", "_updated", "_waiters", "_sequence", "_handle")
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate = max(rate, 1)
+        self.per = max(per, 0.001)
+        self._tokens = float(self.rate)
+        self._updated = monotonic()
+        self._waiters: list[tuple[int, int, Future]] = []
+        self._sequence = count()
+        self._handle: Optional[TimerHandle] = None
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """
+        目前可用之令牌數。
+        """
+        self._refill()
+        return self._tokens
+
+    def _dispatch(self) -> None:
+        # 將可用令牌依序交給優先等級最高之等待者
+        self._handle = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heappop(self._waiters)
+            if future.done(): continue
+            self._tokens -= 1
+            future.set_result(None)
+        # 令牌不足時於補充後再次分配
+        if self._waiters:
+            delay = (1 - self._tokens) * self.per / self.rate
+            self._handle = get_running_loop().call_later(delay, self._dispatch)
+
+    async def acquire(self, priority: int=0) -> float:
+        """
+        取得一個令牌，必要時等待。
+
+        priority: :class:`int`
+            優先等級，數字越小越優先。
+
+        return: :class:`float`
+            等待之秒數。
+        """
+        self._refill()
+        if len(self._waiters) == 0 and self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        start = monotonic()
+        future = get_running_loop().create_future()
+        heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._handle == None: self._dispatch()
+        try: await future
+        except CancelledError:
+            # 已取得令牌後才被取消，將令牌歸還
+            if future.done() and not future.cancelled():
+                self._tokens += 1
+                if self._handle == None: self._dispatch()
+            raise
+        return monotonic() - start
+
+class RouteBuckets:
+    """
+    依路由分別限流。
+    路由名稱可附帶主要參數(例如群組ID)，不同主要參數使用各自之令牌桶。
+    """
+    def __init__(self, limits: Optional[dict[str, tuple[int, float]]]=None, default: tuple[int, float]=(5, 1.0)) -> None:
+        self.limits: dict[str, tuple[int, float]] = dict(limits or {})
+        self.default = default
+        self._buckets: dict[tuple[str, Optional[int]], TokenBucket] = {}
+        self.waited: dict[str, float] = {}
+
+    def configure(self, limits: dict[str, tuple[int, float]]) -> None:
+        """
+        重新設定各路由之限制，既有之令牌桶將被重建。
+
+        limits: :class:`dict[str, tuple[int, float]]`
+            路由名稱對應(次數, 秒數)。
+        """
+        self.limits = {route: (int(rate), float(per)) for route, (rate, per) in limits.items()}
+        self._buckets.clear()
+
+    def get(self, route: str, major: Optional[int]=None) -> TokenBucket:
+        """
+        取得該路由之令牌桶。
+
+        route: :class:`str`
+            路由名稱。
+        major: :class:`int`
+            主要參數。
+
+        return: :class:`TokenBucket`
+        """
+        key = (route, major)
+        bucket = self._buckets.get(key)
+        if bucket == None:
+            bucket = self._buckets[key] = TokenBucket(*self.limits.get(route, self.default))
+        return bucket
+
+    async def acquire(self, route: str, major: Optional[int]=None, priority: int=0) -> None:
+        """
+        取得該路由之令牌，必要時等待。
+
+        route: :class:`str`
+            路由名稱。
+        major: :class:`int`
+            主要參數。
+        priority: :class:`int`
+            優先等級，數字越小越優先。
+        """
+        waited = await self.get(route, major).acquire(priority)
+        if waited: self.waited[route] = self.waited.get(route, 0.0) + waited
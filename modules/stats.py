@@ -0,0 +1,57 @@
+from collections import deque
+from threading import Lock
+from typing import Optional
+
+class LatencyRecorder:
+    """
+    延遲紀錄器，保留最近`maxlen`筆資料以計算百分位數。
+    """
+    def __init__(self, maxlen: int=4096) -> None:
+        self._samples: deque[float] = deque(maxlen=maxlen)
+        self._lock = Lock()
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        """
+        新增一筆延遲。
+
+        seconds: :class:`float`
+            延遲秒數。
+        """
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        取得百分位數(最近值法)。
+
+        percent: :class:`float`
+            百分位，介於0至100。
+
+        return: :class:`float | None`
+            無資料時回傳`None`。
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) == 0: return None
+        index = min(len(samples) - 1, max(0, round(percent / 100 * len(samples) + 0.5) - 1))
+        return samples[index]
+
+    def summary(self) -> str:
+        """
+        取得p50/p99/最大值之摘要。
+
+        return: :class:`str`
+        """
+        if self.count == 0: return "no samples"
+        p50, p99, p100 = self.percentile(50), self.percentile(99), self.percentile(100)
+        return f"n={self.count} p50={p50 * 1000:.1f}ms p99={p99 * 1000:.1f}ms max={p100 * 1000:.1f}ms"
+
+    def reset(self) -> None:
+        """
+        清除所有資料。
+        """
+        with self._lock:
+            self._samples.clear()
+            self.count = 0
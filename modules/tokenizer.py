@@ -0,0 +1,45 @@
+from typing import Iterable, Optional
+
+class CommandTokenizer:
+    """
+    指令解析器。
+    前墜以首字元分組並依長度由長至短比對(最長前墜優先)，且僅移除一次；
+    一般訊息以首字元一次查表即被排除，不需先修飾或轉換大小寫。
+    """
+    __slots__ = ("prefixes", "_table")
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        # 依長度由長至短排列，確保最長前墜優先比對
+        self.prefixes: tuple[str] = tuple(sorted(set(map(str.lower, filter(None, prefixes))), key=len, reverse=True))
+        if len(self.prefixes) == 0: raise ValueError("At least one prefix is required.")
+        # 首字元(含大小寫)對應(前墜, 長度, 是否有大小寫之分)；空白字元對應空元組，表示須先移除開頭空白
+        self._table: dict[str, tuple[tuple[str, int, bool]]] = dict.fromkeys(" \t\r\n", ())
+        for prefix in self.prefixes:
+            candidate = (prefix, len(prefix), prefix != prefix.upper())
+            for head in {prefix[0], prefix[0].upper()}:
+                self._table[head] = self._table.get(head, ()) + (candidate,)
+
+    def tokenize(self, content: str) -> Optional[tuple[str, Optional[tuple[str]]]]:
+        """
+        解析訊息內容。
+
+        content: :class:`str`
+            訊息內容。
+
+        return: :class:`tuple[str, tuple[str] | None] | None`
+            (小寫之指令名稱, 保留大小寫之參數)，若非指令則為`None`。
+        """
+        candidates = self._table.get(content[:1])
+        if candidates == None: return None
+        if len(candidates) == 0:
+            content = content.lstrip()
+            candidates = self._table.get(content[:1])
+            if not candidates: return None
+        for prefix, size, cased in candidates:
+            if content.startswith(prefix) or (cased and content[:size].lower() == prefix): break
+        else: return None
+        rest = content[size:]
+        parts = rest.split()
+        # 前墜後須緊接指令名稱
+        if len(parts) == 0 or rest[0] != parts[0][0]: return None
+        if len(parts) == 1: return parts[0].lower(), None
+        return parts[0].lower(), tuple(parts[1:])
@@ -0,0 +1,31 @@
+from configs import BACKUP_CONFIG, DATABASE_CONFIG
+import db_operation as dbo
+
+from argparse import ArgumentParser
+from os.path import isfile
+
+dbo.POOL.configure(DATABASE_CONFIG.PATH, "none", DATABASE_CONFIG.PRAGMAS)
+dbo.BACKUP.configure(BACKUP_CONFIG.DIR_PATH)
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="自備份檔案還原資料庫，還原前請先關閉機器人。")
+    parser.add_argument("file", nargs="?", help="備份檔案路徑，未指定時列出所有備份。")
+    parser.add_argument("-l", "--latest", action="store_true", help="還原最新之備份。")
+    args = parser.parse_args()
+
+    backups = dbo.BACKUP.list_backups()
+    file: str = args.file
+    if file == None and args.latest:
+        if len(backups) == 0:
+            print(f"`{BACKUP_CONFIG.DIR_PATH}`內沒有備份。")
+            exit(1)
+        file = backups[0]
+    if file == None:
+        for backup in backups: print(backup)
+        exit()
+    if not isfile(file):
+        print(f"找不到備份檔案`{file}`。")
+        exit(1)
+
+    dbo.restore_database(file, DATABASE_CONFIG.PATH)
+    print(f"已將`{file}`還原至`{DATABASE_CONFIG.PATH}`。")
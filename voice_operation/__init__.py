@@ -0,0 +1,8 @@
+from .join import *
+from .pool import *
+from .locks import *
+from .deletion import *
+from .ownership import *
+from .guilds import *
+from .batch import *
+from .scheduler import *
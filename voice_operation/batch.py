@@ -0,0 +1,54 @@
+from asyncio import Semaphore, gather
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+class BatchExecutor:
+    """
+    多位成員之批次操作。
+    以信號量限制同時進行之操作數量(所有批次共用)，並分別收集各成員之成功或失敗。
+    """
+    def __init__(self, concurrency: int=4) -> None:
+        self._concurrency = max(concurrency, 1)
+        self._semaphore: Optional[Semaphore] = None
+        self.succeeded = 0
+        self.failed = 0
+
+    def configure(self, concurrency: int) -> None:
+        """
+        重新設定同時進行之操作數量。
+
+        concurrency: :class:`int`
+            同時進行之數量上限。
+        """
+        self._concurrency = max(concurrency, 1)
+        self._semaphore = None
+
+    async def _run_one(self, item: T, operation: Callable[[T], Awaitable[Any]]) -> Optional[Exception]:
+        async with self._semaphore:
+            try: await operation(item)
+            except Exception as exc: return exc
+        return None
+
+    async def run(self, items: Iterable[T], operation: Callable[[T], Awaitable[Any]]) -> tuple[list[T], list[tuple[T, Exception]]]:
+        """
+        對每個項目並行執行操作。
+
+        items: :class:`Iterable[T]`
+            項目(成員)。
+        operation: :class:`Callable[[T], Awaitable[Any]]`
+            對單一項目之操作，失敗時引發例外。
+
+        return: :class:`tuple[list[T], list[tuple[T, Exception]]]`
+            (成功之項目, (失敗之項目, 例外))，皆保持原順序。
+        """
+        if self._semaphore == None: self._semaphore = Semaphore(self._concurrency)
+        items = list(dict.fromkeys(items))
+        results = await gather(*(self._run_one(item, operation) for item in items))
+        succeeded = [item for item, exc in zip(items, results) if exc == None]
+        failed = [(item, exc) for item, exc in zip(items, results) if exc != None]
+        self.succeeded += len(succeeded)
+        self.failed += len(failed)
+        return succeeded, failed
+
+BATCH = BatchExecutor()
@@ -0,0 +1,118 @@
+from asyncio import CancelledError, Task, create_task, current_task, sleep as a_sleep
+from logging import getLogger
+from typing import Awaitable, Callable
+
+logger = getLogger("main")
+
+class DeletionScheduler:
+    """
+    延遲刪除頻道。
+    頻道清空後等待`grace`秒才刪除，期間若有人加入則取消刪除並沿用該頻道。
+    """
+    def __init__(self, grace: float=15) -> None:
+        self.grace = max(grace, 0)
+        self._timers: dict[int, Task] = {}
+        self.scheduled = 0
+        self.cancelled = 0
+        self.executed = 0
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def configure(self, grace: float) -> None:
+        """
+        設定等待時間。
+
+        grace: :class:`float`
+            清空後至刪除之秒數，`0`表示立即刪除。
+        """
+        self.grace = max(grace, 0)
+
+    def pending(self, channel_id: int) -> bool:
+        """
+        檢查該頻道是否正等待刪除。
+
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`bool`
+        """
+        return channel_id in self._timers
+
+    async def _timer(self, channel_id: int, callback: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await a_sleep(self.grace)
+        except CancelledError:
+            return
+        # 須於刪除函數內呼叫`claim`後才不可取消
+        try:
+            await callback()
+        except Exception as exc:
+            logger.error(f"Delete channel<{channel_id}> failed: {exc!r}")
+
+    def schedule(self, channel_id: int, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        排定刪除頻道，已排定者將重新計時。需於事件迴圈內呼叫。
+
+        channel_id: :class:`int`
+            頻道ID。
+        callback: :class:`Callable[[], Awaitable[None]]`
+            刪除頻道之函數。
+        """
+        self.discard(channel_id)
+        self.scheduled += 1
+        self._timers[channel_id] = create_task(self._timer(channel_id, callback))
+
+    def claim(self, channel_id: int) -> bool:
+        """
+        於刪除函數內(持有頻道鎖並確認頻道仍為空後)呼叫，確認刪除仍有效，
+        此後即不可取消並計入執行次數。
+
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`bool`
+            刪除是否仍有效，若已被取消或重新排定則為`False`。
+        """
+        if self._timers.get(channel_id) != current_task(): return False
+        del self._timers[channel_id]
+        self.executed += 1
+        return True
+
+    def cancel(self, channel_id: int) -> bool:
+        """
+        因有人重新加入而取消刪除。
+
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`bool`
+            是否有取消排定之刪除。
+        """
+        if not self.discard(channel_id): return False
+        self.cancelled += 1
+        return True
+
+    def discard(self, channel_id: int) -> bool:
+        """
+        移除排定之刪除，不計入取消次數(例如頻道已被刪除)。
+
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`bool`
+            是否有排定之刪除。
+        """
+        task = self._timers.pop(channel_id, None)
+        if task == None: return False
+        task.cancel()
+        return True
+
+    def stop(self) -> None:
+        """
+        取消所有排定之刪除，剩餘之空頻道將於下次啟動時整理。
+        """
+        for channel_id in list(self._timers.keys()):
+            self.discard(channel_id)
+
+DELETIONS = DeletionScheduler()
@@ -0,0 +1,139 @@
+from .pool import ChannelPool
+
+from typing import Any, Iterator, Optional
+
+class GuildState:
+    """
+    單一群組之執行狀態。
+    """
+    __slots__ = ("guild_id", "initial_channel_id", "category_id", "initial_channel", "category", "guild_key", "pool")
+    def __init__(self, guild_id: int, initial_channel_id: int, category_id: int=0, pool_size: int=0) -> None:
+        self.guild_id = guild_id
+        self.initial_channel_id = initial_channel_id
+        self.category_id = category_id
+        self.initial_channel: Optional[Any] = None
+        self.category: Optional[Any] = None
+        self.guild_key: int = guild_id
+        self.pool = ChannelPool(pool_size)
+
+class GuildRegistry:
+    """
+    群組設定與狀態之註冊表。
+    以群組ID、起始頻道ID與類別ID對應至群組狀態，皆為O(1)查詢。
+    """
+    def __init__(self) -> None:
+        self._guilds: dict[int, GuildState] = {}
+        self._initial_channels: dict[int, GuildState] = {}
+        self._categories: dict[int, GuildState] = {}
+
+    def __iter__(self) -> Iterator[GuildState]:
+        return iter(tuple(self._guilds.values()))
+
+    def __len__(self) -> int:
+        return len(self._guilds)
+
+    def register(self, guild_id: int, initial_channel_id: int, category_id: int=0, pool_size: int=0) -> GuildState:
+        """
+        註冊群組設定。
+
+        guild_id: :class:`int`
+            群組ID。
+        initial_channel_id: :class:`int`
+            起始頻道ID。
+        category_id: :class:`int`
+            動態語音類別ID，`0`表示使用起始頻道所屬之類別。
+        pool_size: :class:`int`
+            備用頻道數量。
+
+        return: :class:`GuildState`
+        """
+        if guild_id in self._guilds: raise ValueError(f"Guild `{guild_id}` already registered.")
+        state = self._guilds[guild_id] = GuildState(guild_id, initial_channel_id, category_id, pool_size)
+        self._initial_channels[initial_channel_id] = state
+        return state
+
+    def remove(self, guild_id: int) -> None:
+        """
+        移除群組設定。
+
+        guild_id: :class:`int`
+            群組ID。
+        """
+        state = self._guilds.pop(guild_id, None)
+        if state == None: return
+        self._initial_channels.pop(state.initial_channel_id, None)
+        if state.category != None: self._categories.pop(state.category.id, None)
+
+    def bind(self, state: GuildState, initial_channel: Any, category: Any, guild_key: int) -> None:
+        """
+        於連線後綁定群組之起始頻道、類別與資料庫鍵值。
+
+        state: :class:`GuildState`
+            群組狀態。
+        initial_channel: :class:`VoiceChannel`
+            起始頻道。
+        category: :class:`CategoryChannel`
+            動態語音類別。
+        guild_key: :class:`int`
+            資料庫群組鍵值。
+        """
+        if state.category != None: self._categories.pop(state.category.id, None)
+        state.initial_channel = initial_channel
+        state.category = category
+        state.category_id = category.id
+        state.guild_key = guild_key
+        self._categories[category.id] = state
+
+    def get(self, guild_id: int) -> Optional[GuildState]:
+        """
+        以群組ID取得群組狀態。
+
+        return: :class:`GuildState | None`
+        """
+        return self._guilds.get(guild_id)
+
+    def by_initial_channel(self, channel_id: int) -> Optional[GuildState]:
+        """
+        以起始頻道ID取得群組狀態。
+
+        return: :class:`GuildState | None`
+        """
+        return self._initial_channels.get(channel_id)
+
+    def by_category(self, category_id: Optional[int]) -> Optional[GuildState]:
+        """
+        以類別ID取得群組狀態。
+
+        return: :class:`GuildState | None`
+        """
+        if category_id == None: return None
+        return self._categories.get(category_id)
+
+    def for_channel(self, channel: Any) -> Optional[GuildState]:
+        """
+        取得頻道所屬動態語音類別之群組狀態。
+
+        channel: :class:`GuildChannel`
+            頻道。
+
+        return: :class:`GuildState | None`
+            若頻道不在任何動態語音類別內則為`None`。
+        """
+        return self.by_category(getattr(channel, "category_id", None))
+
+    def for_voice(self, channel: Any) -> Optional[GuildState]:
+        """
+        取得語音頻道之群組狀態，起始頻道可位於動態語音類別之外。
+
+        channel: :class:`VoiceChannel`
+            語音頻道。
+
+        return: :class:`GuildState | None`
+            若頻道既非起始頻道亦不在任何動態語音類別內則為`None`。
+        """
+        state = self.by_initial_channel(channel.id)
+        # 起始頻道須屬於該群組
+        if state != None and state.guild_id == channel.guild.id: return state
+        return self.for_channel(channel)
+
+GUILDS = GuildRegistry()
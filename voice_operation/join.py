@@ -0,0 +1,60 @@
+from modules import LatencyRecorder
+
+from asyncio import Semaphore
+from time import perf_counter
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+class JoinPipeline:
+    """
+    加入起始頻道之處理流程。
+    同時處理多位使用者之加入，並限制同時進行之數量；各路由之呼叫頻率由`RestScheduler`限制。
+    """
+    def __init__(self, concurrency: int=8) -> None:
+        self._concurrency = max(concurrency, 1)
+        self._semaphore: Optional[Semaphore] = None
+        self._pending = 0
+        self.latency = LatencyRecorder()
+
+    @property
+    def pending(self) -> int:
+        """
+        目前尚未完成之加入數量(包含等待中者)。
+        """
+        return self._pending
+
+    def configure(self, concurrency: int) -> None:
+        """
+        重新設定同時處理數量。
+
+        concurrency: :class:`int`
+            同時處理之數量上限。
+        """
+        self._concurrency = max(concurrency, 1)
+        self._semaphore = None
+
+    async def submit(self, handler: Callable[..., Awaitable[T]], *args, start: Optional[float]=None) -> T:
+        """
+        排入一次加入處理，並記錄自事件發生至處理完成之延遲。
+
+        handler: :class:`Callable`
+            處理函數。
+        start: :class:`float`
+            事件發生之時間(`perf_counter`)，預設為呼叫時。
+
+        return: :class:`T`
+            處理函數之回傳值。
+        """
+        if start == None: start = perf_counter()
+        if self._semaphore == None: self._semaphore = Semaphore(self._concurrency)
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                result = await handler(*args)
+        finally:
+            self._pending -= 1
+        self.latency.record(perf_counter() - start)
+        return result
+
+JOIN_PIPELINE = JoinPipeline()
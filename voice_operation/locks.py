@@ -0,0 +1,4 @@
+from modules import KeyedLock
+
+# 以頻道ID為鍵值之鎖，確保同一頻道之事件與指令依序執行
+CHANNEL_LOCKS = KeyedLock()
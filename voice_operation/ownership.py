@@ -0,0 +1,75 @@
+from asyncio import Future, TimeoutError, get_running_loop, shield, wait_for
+from contextlib import contextmanager
+from typing import Iterator
+
+class ChannelOwnership:
+    """
+    記錄由機器人創建之頻道。
+    頻道創建事件可能早於API回應抵達，若當下仍有創建中之頻道，
+    則等待該頻道被登記或所有創建完成，最多等待`timeout`秒。
+    """
+    def __init__(self, timeout: float=10) -> None:
+        self.timeout = timeout
+        self._owned: set[int] = set()
+        self._waiters: dict[int, Future] = {}
+        self._creating = 0
+
+    @contextmanager
+    def creating(self) -> Iterator[None]:
+        """
+        標記創建頻道之API呼叫進行中。
+        """
+        self._creating += 1
+        try:
+            yield
+        finally:
+            self._creating -= 1
+            if self._creating == 0:
+                # 所有創建皆已完成，尚未登記之頻道皆非機器人創建
+                for future in self._waiters.values():
+                    if not future.done(): future.set_result(False)
+                self._waiters.clear()
+
+    def register(self, channel_id: int) -> None:
+        """
+        登記由機器人創建之頻道。
+
+        channel_id: :class:`int`
+            頻道ID。
+        """
+        self._owned.add(channel_id)
+        future = self._waiters.pop(channel_id, None)
+        if future != None and not future.done(): future.set_result(True)
+
+    def release(self, channel_id: int) -> None:
+        """
+        移除已刪除之頻道。
+
+        channel_id: :class:`int`
+            頻道ID。
+        """
+        self._owned.discard(channel_id)
+        future = self._waiters.pop(channel_id, None)
+        if future != None and not future.done(): future.set_result(False)
+
+    async def is_owned(self, channel_id: int) -> bool:
+        """
+        檢查該頻道是否由機器人創建。
+
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`bool`
+        """
+        if channel_id in self._owned: return True
+        if self._creating == 0: return False
+        future = self._waiters.get(channel_id)
+        if future == None:
+            future = self._waiters[channel_id] = get_running_loop().create_future()
+        try:
+            return await wait_for(shield(future), self.timeout)
+        except TimeoutError:
+            self._waiters.pop(channel_id, None)
+            return False
+
+OWNERSHIP = ChannelOwnership()
@@ -0,0 +1,130 @@
+from asyncio import Task, create_task
+from collections import deque
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Optional
+
+logger = getLogger("main")
+
+# 備用頻道之名稱
+POOL_CHANNEL_NAME = "dvc-spare"
+
+def is_spare(channel: Any) -> bool:
+    """
+    檢查頻道是否為機器人創建之備用頻道(啟動時使用)。
+    除名稱外，須對@everyone隱藏且僅機器人可管理，避免收回使用者自行創建之同名頻道。
+
+    channel: :class:`VoiceChannel`
+        頻道。
+
+    return: :class:`bool`
+    """
+    if channel.name != POOL_CHANNEL_NAME: return False
+    everyone = channel.overwrites_for(channel.guild.default_role)
+    me = channel.overwrites_for(channel.guild.me)
+    return everyone.view_channel == False and everyone.connect == False and me.manage_channels == True
+
+class ChannelPool:
+    """
+    預先創建之隱藏備用語音頻道。
+    使用者加入起始頻道時直接取用備用頻道，省去創建頻道之等待，並於背景補充。
+    """
+    def __init__(self, size: int=0) -> None:
+        self.size = max(size, 0)
+        self._spares: deque = deque()
+        self._ids: set[int] = set()
+        self._factory: Optional[Callable[[], Awaitable[Any]]] = None
+        self._task: Optional[Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._spares)
+
+    def configure(self, size: Optional[int]=None, factory: Optional[Callable[[], Awaitable[Any]]]=None) -> None:
+        """
+        設定備用頻道數量與創建函數。
+
+        size: :class:`int`
+            備用頻道數量，`0`表示停用。
+        factory: :class:`Callable[[], Awaitable[VoiceChannel]]`
+            創建備用頻道之函數。
+        """
+        if size != None: self.size = max(size, 0)
+        if factory != None: self._factory = factory
+
+    def is_pooled(self, channel_id: int) -> bool:
+        """
+        檢查該頻道是否為尚未取用之備用頻道。
+
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`bool`
+        """
+        return channel_id in self._ids
+
+    def adopt(self, channel: Any) -> bool:
+        """
+        將既有之頻道加入備用頻道(啟動時使用)。
+
+        channel: :class:`VoiceChannel`
+            頻道。
+
+        return: :class:`bool`
+            是否加入，若備用頻道已滿則為`False`。
+        """
+        if channel.id in self._ids: return True
+        if len(self._spares) >= self.size: return False
+        self._spares.append(channel)
+        self._ids.add(channel.id)
+        return True
+
+    def take(self) -> Optional[Any]:
+        """
+        取用一個備用頻道，並於背景補充。
+
+        return: :class:`VoiceChannel | None`
+            備用頻道，若無則為`None`。
+        """
+        if len(self._spares) == 0:
+            if self.size: self.misses += 1
+            self.refill()
+            return None
+        channel = self._spares.popleft()
+        self._ids.discard(channel.id)
+        self.hits += 1
+        self.refill()
+        return channel
+
+    def discard(self, channel_id: int) -> None:
+        """
+        移除已不存在之備用頻道。
+
+        channel_id: :class:`int`
+            頻道ID。
+        """
+        if channel_id not in self._ids: return
+        self._ids.discard(channel_id)
+        for channel in self._spares:
+            if channel.id == channel_id:
+                self._spares.remove(channel)
+                break
+        self.refill()
+
+    async def _refill(self) -> None:
+        while len(self._spares) < self.size:
+            try:
+                channel = await self._factory()
+            except Exception as exc:
+                logger.error(f"Create spare channel failed: {exc!r}")
+                return
+            self._spares.append(channel)
+            self._ids.add(channel.id)
+
+    def refill(self) -> None:
+        """
+        於背景補充備用頻道至設定數量，需於事件迴圈內呼叫。
+        """
+        if self._factory == None or len(self._spares) >= self.size: return
+        if self._task != None and not self._task.done(): return
+        self._task = create_task(self._refill())
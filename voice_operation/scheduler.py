@@ -0,0 +1,130 @@
+from modules import LatencyRecorder, RouteBuckets
+
+from asyncio import CancelledError, Future, get_running_loop
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 優先等級，數字越小越優先
+INTERACTIVE = 0     # 使用者正在等待之操作: 加入後創建並移入頻道、指令
+LIFECYCLE = 1       # 頻道生命週期: 備用頻道、刪除頻道、管理員權限
+NOTIFICATION = 2    # 通知訊息
+PRIORITY_NAMES = ("interactive", "lifecycle", "notification")
+
+# 各路由之預設限制(次數, 秒數)
+ROUTE_LIMITS: dict[str, tuple[int, float]] = {
+    "create_channel": (5, 5.0),
+    "move_member": (10, 1.0),
+    "edit_channel": (5, 5.0),
+    "delete_channel": (5, 5.0),
+    "send_message": (5, 5.0),
+}
+
+class RestScheduler:
+    """
+    對外API呼叫之排程器。
+    限制同時進行之呼叫數量，有空位時優先交給優先等級較高之呼叫(同等級依先後順序)。
+    先取得該路由之令牌再等待空位，避免受限流之呼叫於等待令牌時佔用空位；
+    同一路由之令牌亦依優先等級分配。
+    """
+    def __init__(self, concurrency: int=4, limits: Optional[dict[str, tuple[int, float]]]=None) -> None:
+        self._concurrency = max(concurrency, 1)
+        self._active = 0
+        self._waiters: list[tuple[int, int, Future]] = []
+        self._sequence = count()
+        self.buckets = RouteBuckets(ROUTE_LIMITS if limits == None else limits)
+        # 各優先等級之等待數量、最大等待數量與等待時間
+        self.depth = [0] * len(PRIORITY_NAMES)
+        self.max_depth = [0] * len(PRIORITY_NAMES)
+        self.waits = [LatencyRecorder() for _ in PRIORITY_NAMES]
+        # 各路由之呼叫次數
+        self.calls: dict[str, int] = {}
+
+    @property
+    def active(self) -> int:
+        """
+        進行中之呼叫數量。
+        """
+        return self._active
+
+    def configure(self, concurrency: Optional[int]=None, limits: Optional[dict[str, tuple[int, float]]]=None) -> None:
+        """
+        重新設定同時進行之呼叫數量與路由限制。
+
+        concurrency: :class:`int`
+            同時進行之數量上限。
+        limits: :class:`dict[str, tuple[int, float]]`
+            路由名稱對應(次數, 秒數)，未指定之路由使用預設限制。
+        """
+        if limits != None: self.buckets.configure({**ROUTE_LIMITS, **limits})
+        if concurrency == None: return
+        self._concurrency = max(concurrency, 1)
+        # 放寬上限時立即喚醒等待者
+        while self._waiters and self._active < self._concurrency:
+            self._active += 1
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        if self._active < self._concurrency and len(self._waiters) == 0:
+            self._active += 1
+            return
+        future = get_running_loop().create_future()
+        heappush(self._waiters, (priority, next(self._sequence), future))
+        self.depth[priority] += 1
+        self.max_depth[priority] = max(self.max_depth[priority], self.depth[priority])
+        try: await future
+        except CancelledError:
+            # 已取得空位後才被取消，將空位交給下一位
+            if future.done() and not future.cancelled(): self._release()
+            raise
+        finally:
+            self.depth[priority] -= 1
+
+    def _release(self) -> None:
+        # 將空位直接交給優先等級最高之等待者
+        while self._waiters:
+            _, _, future = heappop(self._waiters)
+            if future.done(): continue
+            future.set_result(None)
+            return
+        self._active -= 1
+
+    async def request(self, priority: int, route: str, major: Optional[int], func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """
+        排入一次API呼叫並等待其結果。
+
+        priority: :class:`int`
+            優先等級: `INTERACTIVE`、`LIFECYCLE`或`NOTIFICATION`。
+        route: :class:`str`
+            路由名稱。
+        major: :class:`int | None`
+            主要參數(群組ID或頻道ID)。
+        func: :class:`Callable[..., Awaitable[T]]`
+            API呼叫。
+
+        return: :class:`T`
+            API呼叫之回傳值。
+        """
+        start = perf_counter()
+        await self.buckets.acquire(route, major, priority)
+        await self._acquire(priority)
+        try:
+            self.waits[priority].record(perf_counter() - start)
+            self.calls[route] = self.calls.get(route, 0) + 1
+            return await func(*args, **kwargs)
+        finally:
+            self._release()
+
+    def summary(self) -> str:
+        """
+        各優先等級之等待時間與最大佇列長度之摘要。
+        """
+        return ", ".join(
+            f"{name} {self.waits[priority].summary()} max_depth={self.max_depth[priority]}"
+            for priority, name in enumerate(PRIORITY_NAMES)
+        )
+
+SCHEDULER = RestScheduler()